@@ -0,0 +1,52 @@
+"""Store prediction JSON columns as JSONB on PostgreSQL
+
+Revision ID: 5e9a0c7b1f24
+Revises: d2b7e5f0c318
+Create Date: 2026-10-17 13:26:48.105372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a0c7b1f24'
+down_revision: Union[str, Sequence[str], None] = 'd2b7e5f0c318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = ('input_features', 'shap_values', 'key_factors')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite has a single JSON representation; nothing to change there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'predictions',
+            column,
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::jsonb',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'predictions',
+            column,
+            existing_type=postgresql.JSONB(),
+            type_=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::json',
+        )
@@ -0,0 +1,40 @@
+"""Add server default for loan_applications.application_status
+
+Revision ID: 7c1d2e9a4b60
+Revises: 3ee9445eb664
+Create Date: 2026-10-17 09:12:41.308214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d2e9a4b60'
+down_revision: Union[str, Sequence[str], None] = '3ee9445eb664'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('loan_applications') as batch_op:
+        batch_op.alter_column(
+            'application_status',
+            existing_type=sa.String(length=50),
+            existing_nullable=True,
+            server_default='approved',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('loan_applications') as batch_op:
+        batch_op.alter_column(
+            'application_status',
+            existing_type=sa.String(length=50),
+            existing_nullable=True,
+            server_default=None,
+        )
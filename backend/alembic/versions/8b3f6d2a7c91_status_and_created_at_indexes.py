@@ -0,0 +1,30 @@
+"""Index loan_applications.application_status and predictions.created_at
+
+Revision ID: 8b3f6d2a7c91
+Revises: 5e9a0c7b1f24
+Create Date: 2026-10-17 15:02:13.847120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3f6d2a7c91'
+down_revision: Union[str, Sequence[str], None] = '5e9a0c7b1f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_loan_applications_application_status'), 'loan_applications', ['application_status'], unique=False)
+    op.create_index(op.f('ix_predictions_created_at'), 'predictions', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_predictions_created_at'), table_name='predictions')
+    op.drop_index(op.f('ix_loan_applications_application_status'), table_name='loan_applications')
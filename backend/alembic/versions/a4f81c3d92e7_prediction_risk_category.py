@@ -0,0 +1,44 @@
+"""Add indexed predictions.risk_category
+
+Revision ID: a4f81c3d92e7
+Revises: 7c1d2e9a4b60
+Create Date: 2026-10-17 11:03:27.519840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f81c3d92e7'
+down_revision: Union[str, Sequence[str], None] = '7c1d2e9a4b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('predictions') as batch_op:
+        batch_op.add_column(sa.Column('risk_category', sa.String(length=10), nullable=True))
+        batch_op.create_index(batch_op.f('ix_predictions_risk_category'), ['risk_category'], unique=False)
+
+    # Backfill from the display labels ("High Risk 🔴", ...); other labels such as
+    # "Historical" have no category and stay NULL
+    op.execute(
+        """
+        UPDATE predictions SET risk_category = CASE
+            WHEN risk_level LIKE '%High Risk%' THEN 'high'
+            WHEN risk_level LIKE '%Borderline Risk%' THEN 'borderline'
+            WHEN risk_level LIKE '%Low Risk%' THEN 'low'
+        END
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('predictions') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_predictions_risk_category'))
+        batch_op.drop_column('risk_category')
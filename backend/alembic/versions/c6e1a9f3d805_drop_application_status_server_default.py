@@ -0,0 +1,40 @@
+"""Drop the server default on loan_applications.application_status
+
+Revision ID: c6e1a9f3d805
+Revises: 8b3f6d2a7c91
+Create Date: 2026-10-17 18:40:27.513906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e1a9f3d805'
+down_revision: Union[str, Sequence[str], None] = '8b3f6d2a7c91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('loan_applications') as batch_op:
+        batch_op.alter_column(
+            'application_status',
+            existing_type=sa.String(length=50),
+            existing_nullable=True,
+            server_default=None,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('loan_applications') as batch_op:
+        batch_op.alter_column(
+            'application_status',
+            existing_type=sa.String(length=50),
+            existing_nullable=True,
+            server_default='approved',
+        )
@@ -0,0 +1,32 @@
+"""Add composite indexes for filtered, newest-first listings
+
+Revision ID: d2b7e5f0c318
+Revises: a4f81c3d92e7
+Create Date: 2026-10-17 11:41:09.274613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e5f0c318'
+down_revision: Union[str, Sequence[str], None] = 'a4f81c3d92e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_predictions_application_id_created_at', 'predictions', ['application_id', 'created_at'], unique=False)
+    op.create_index('ix_predictions_model_type_created_at', 'predictions', ['model_type', 'created_at'], unique=False)
+    op.create_index('ix_model_metrics_model_type_evaluation_date', 'model_metrics', ['model_type', 'evaluation_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_model_metrics_model_type_evaluation_date', table_name='model_metrics')
+    op.drop_index('ix_predictions_model_type_created_at', table_name='predictions')
+    op.drop_index('ix_predictions_application_id_created_at', table_name='predictions')
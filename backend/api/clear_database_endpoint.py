@@ -8,7 +8,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from backend.database import get_db, models
+from backend.database import crud, get_db, models
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +40,6 @@ def clear_database(confirm: bool = False, drop_tables: bool = False, db: Session
             logger.warning("⚠️  DROPPING ALL TABLES - This is a destructive operation!")
             
             # Use CRUD function to drop tables
-            from backend.database import crud
             crud.drop_loan_application_table(db)
             
             logger.info("✅ All tables dropped.")
@@ -68,6 +67,7 @@ def clear_database(confirm: bool = False, drop_tables: bool = False, db: Session
         db.query(models.ModelMetrics).delete()
 
         db.commit()
+        crud.invalidate_statistics_cache()
 
         logger.info(f"✅ Database cleared successfully. Deleted: {counts_before}")
 
@@ -2,14 +2,16 @@
 FastAPI application entry point for Credit Risk Prediction API.
 
 This module initializes the FastAPI application, configures middleware,
-sets up routing, and handles startup events.
+sets up routing, and handles startup/shutdown events.
 """
 
 import logging
 
+import orjson
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request
+from fastapi import APIRouter, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
@@ -22,6 +24,7 @@ from backend.api.routes.prediction import router as prediction_router
 from backend.api.routes.retraining import router as retraining_router
 from backend.core.logging_setup import configure_logging
 from backend.database import check_connection, init_db
+from backend.utils.ai_client import close_ai_client
 
 # --- Setup Logging ---
 configure_logging()
@@ -38,6 +41,7 @@ app = FastAPI(
     title="Credit Risk Prediction API",
     version="2.0.0",
     description="AI-powered credit risk prediction with XGBoost ML model, SHAP explainability, and AI-generated insights.",
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiter to app state
@@ -64,6 +68,12 @@ async def startup_event():
     ModelManager.load_models()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled outbound connections."""
+    await close_ai_client()
+
+
 # Allow cross-origin requests from local frontend (development)
 origins = [
     "http://localhost",
@@ -82,9 +92,10 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# API versioning: Mount routers under /api/v1 for versioned endpoints
-# Also include at root level for backward compatibility (hidden from schema)
-api_v1_router = FastAPI()
+# API versioning: Include routers under /api/v1 for versioned endpoints
+API_V1_PREFIX = "/api/v1"
+
+api_v1_router = APIRouter(prefix=API_V1_PREFIX)
 api_v1_router.include_router(clear_db_router, tags=["database"])
 api_v1_router.include_router(model_router, tags=["model"])
 api_v1_router.include_router(prediction_router, tags=["prediction"])
@@ -92,24 +103,40 @@ api_v1_router.include_router(retraining_router, tags=["retraining"])
 api_v1_router.include_router(data_router, tags=["data"])
 api_v1_router.include_router(chatbot_router, tags=["chatbot"])
 
-# Mount versioned API
-app.mount("/api/v1", api_v1_router)
+app.include_router(api_v1_router)
 
-# Include routers at root for backward compatibility (excluded from OpenAPI schema)
-app.include_router(clear_db_router, tags=["database"], include_in_schema=False)
-app.include_router(model_router, tags=["model"], include_in_schema=False)
-app.include_router(prediction_router, tags=["prediction"], include_in_schema=False)
-app.include_router(retraining_router, tags=["retraining"], include_in_schema=False)
-app.include_router(data_router, tags=["data"], include_in_schema=False)
-app.include_router(chatbot_router, tags=["chatbot"], include_in_schema=False)
 
+class LegacyPathRewriteMiddleware:
+    """
+    Serve unversioned legacy paths (e.g. /predict_risk) from the /api/v1 routes.
 
-@app.get("/")
-@limiter.limit("5/minute")
-def root(request: Request):
-    return {"message": "Credit Risk Prediction API is running. Visit /docs for documentation."}
+    Rewrites the request path in the ASGI scope instead of registering every
+    router a second time at the root, so the route table is only built once.
+    """
+
+    # Paths served by the root app itself
+    ROOT_PATHS = frozenset({"/", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"})
+
+    def __init__(self, app):
+        self.app = app
 
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if not path.startswith(API_V1_PREFIX) and path not in self.ROOT_PATHS:
+                scope["path"] = API_V1_PREFIX + path
+        await self.app(scope, receive, send)
 
-@app.get("/health")
-def health_check():
-    return {"status": "ok"}
+
+# Keep root-level paths working for backward compatibility
+app.add_middleware(LegacyPathRewriteMiddleware)
+
+
+# Static response body, serialized once at import instead of on every request
+ROOT_BODY = orjson.dumps({"message": "Credit Risk Prediction API is running. Visit /docs for documentation."})
+
+
+@app.get("/")
+@limiter.limit("5/minute")
+async def root(request: Request):
+    return Response(content=ROOT_BODY, media_type="application/json")
@@ -1,42 +1,16 @@
 import logging
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Body, HTTPException
-from pydantic import BaseModel, Field
+import orjson
+from fastapi import APIRouter, Body, HTTPException, Response
+from pydantic import BaseModel, ConfigDict, Field
 
 from backend.utils.ai_client import get_ai_client
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-
-class ChatMessage(BaseModel):
-    role: str
-    content: str
-
-
-class ChatRequest(BaseModel):
-    query: str = Field(..., description="The user's query string")
-    history: Optional[List[ChatMessage]] = []
-    context: Optional[Dict[str, Any]] = None
-
-
-@router.post("/chatbot/query")
-async def chatbot_query(request: ChatRequest):
-    """
-    Process a user query via the AI chatbot.
-    """
-    try:
-        ai_client = get_ai_client()
-
-        if not ai_client.is_available():
-            return {
-                "response": "I apologize, but I am currently offline (API key not configured). Please check the system configuration.",
-                "error": "no_api_key",
-            }
-
-        # Construct prompt with history
-        system_prompt = """You are the dedicated AI Assistant for the Credit Risk Prediction System.
+CHATBOT_SYSTEM_PROMPT = """You are the dedicated AI Assistant for the Credit Risk Prediction System.
         
         Your SOLE purpose is to assist users with this specific application.
         
@@ -57,6 +31,47 @@ async def chatbot_query(request: ChatRequest):
         The user is interacting with the web dashboard of the Credit Risk Prediction System.
         """
 
+# Fixed reply when no API key is configured, serialized once at import
+OFFLINE_RESPONSE_BODY = orjson.dumps(
+    {
+        "response": "I apologize, but I am currently offline (API key not configured). Please check the system configuration.",
+        "error": "no_api_key",
+    }
+)
+
+
+# Request size bounds; the frontend sends at most its last 10 messages, and replies
+# from the model can run well past the 4096-character query limit
+CHAT_HISTORY_MAX_MESSAGES = 20
+CHAT_MESSAGE_MAX_LENGTH = 16384
+
+
+class ChatMessage(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    role: str = Field(..., max_length=32)
+    content: str = Field(..., max_length=CHAT_MESSAGE_MAX_LENGTH)
+
+
+class ChatRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    query: str = Field(..., description="The user's query string", max_length=4096)
+    history: Optional[List[ChatMessage]] = Field(default=[], max_length=CHAT_HISTORY_MAX_MESSAGES)
+    context: Optional[Dict[str, Any]] = None
+
+
+@router.post("/chatbot/query")
+async def chatbot_query(request: ChatRequest):
+    """
+    Process a user query via the AI chatbot.
+    """
+    try:
+        ai_client = get_ai_client()
+
+        if not ai_client.is_available():
+            return Response(content=OFFLINE_RESPONSE_BODY, media_type="application/json")
+
         # Build conversation context
         messages_text = ""
         if request.history:
@@ -76,7 +91,7 @@ async def chatbot_query(request: ChatRequest):
         """
 
         # Call AI
-        result = await ai_client.generate_with_retry(prompt, system_prompt)
+        result = await ai_client.generate_with_retry(prompt, CHATBOT_SYSTEM_PROMPT)
 
         if result.get("error"):
             logger.warning(f"Chatbot error: {result.get('error')}")
@@ -1,14 +1,17 @@
 import io
-import json
 import logging
+from datetime import datetime, timezone
 from typing import Any, Dict, List
 
+import numpy as np
+import orjson
 import pandas as pd
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile, Form
 from sqlalchemy.orm import Session
 
-from backend.database import crud, models
-from backend.database.config import get_db, engine
+from backend.database import crud
+from backend.database.config import get_db
+from backend.services.imputation import TARGET_COLUMNS
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -18,21 +21,20 @@ def get_table_schema(table_name: str, db: Session = Depends(get_db)):
     """
     Get column names for a specific table.
     """
-    from sqlalchemy import inspect
-    
     try:
-        inspector = inspect(engine)
-        if not inspector.has_table(table_name):
+        columns = crud.get_table_columns(db, table_name)
+        if columns is None:
             raise HTTPException(status_code=404, detail=f"Table {table_name} not found")
             
-        columns = [c["name"] for c in inspector.get_columns(table_name)]
         return {"table": table_name, "columns": columns}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get schema for {table_name}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/db/import_csv")
-async def import_csv_data(
+def import_csv_data(
     background_tasks: BackgroundTasks, 
     file: UploadFile = File(...), 
     replace_schema: bool = False,
@@ -57,9 +59,9 @@ async def import_csv_data(
         mapping = {}
         if column_mapping:
             try:
-                mapping = json.loads(column_mapping)
+                mapping = orjson.loads(column_mapping)
                 logger.info(f"Using provided column mapping: {mapping}")
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.warning("Invalid JSON in column_mapping, falling back to default")
         
         if not mapping:
@@ -88,12 +90,15 @@ async def import_csv_data(
         chunk_size = 1000
         
         # Process in chunks
-        # file.file is a SpooledTemporaryFile which works with pd.read_csv
+        # file.file is a SpooledTemporaryFile which works with pd.read_csv.
+        # The endpoint is sync so these blocking reads and DB inserts run in the
+        # threadpool instead of stalling the event loop.
         csv_iterator = pd.read_csv(file.file, chunksize=chunk_size)
         
-        from sqlalchemy import MetaData, Table, Float, String, inspect
+        from sqlalchemy import Float, String
         
         first_chunk = True
+        use_copy = crud.supports_copy(db)
         
         for i, df in enumerate(csv_iterator):
             # Standardize column names
@@ -104,49 +109,52 @@ async def import_csv_data(
             
             # Handle Schema (only on first chunk)
             if first_chunk:
-                inspector = inspect(engine)
-                if not inspector.has_table("loan_applications"):
+                # read_csv has already inferred dtypes while parsing, so classify
+                # all columns in one pass over the dtypes instead of per column
+                numeric_columns = set(df.select_dtypes(include=["number", "bool"]).columns)
+
+                existing_columns = crud.get_table_columns(db, "loan_applications")
+                if existing_columns is None:
                     logger.info("Table loan_applications does not exist. Creating...")
                     
-                    csv_columns = {}
-                    for col in df.columns:
-                        dtype = df[col].dtype
-                        if pd.api.types.is_numeric_dtype(dtype):
-                            csv_columns[col] = Float
-                        else:
-                            csv_columns[col] = String(255)
+                    csv_columns = {col: Float if col in numeric_columns else String(255) for col in df.columns}
                     
                     crud.create_loan_application_table(db, csv_columns)
                     db.commit()
                 else:
                     # Append mode: Ensure columns exist
                     # We check all columns in the first chunk against DB
-                    existing_columns = {c["name"] for c in inspector.get_columns("loan_applications")}
+                    existing_columns = set(existing_columns)
                     
-                    for col in df.columns:
-                        if col not in existing_columns:
-                            # Infer type
-                            dtype = df[col].dtype
-                            col_type = "FLOAT" if pd.api.types.is_numeric_dtype(dtype) else "VARCHAR(255)"
-                            crud.add_column_if_not_exists(db, "loan_applications", col, col_type)
-                
+                    crud.add_columns_if_not_exist(
+                        db,
+                        "loan_applications",
+                        {
+                            col: "FLOAT" if col in numeric_columns else "VARCHAR(255)"
+                            for col in df.columns
+                            if col not in existing_columns
+                        },
+                    )
+
+                # Reflect the (possibly just altered) table once and reuse it for every chunk
+                table = crud.get_loan_application_table(db)
                 first_chunk = False
 
             # Prepare data for bulk insert
             app_data_list = []
             
             # Pre-process dataframe to dicts
-            # Replace NaNs with None
-            # We convert to object first to ensure None is accepted in numeric columns
-            df_dict = df.astype(object).where(pd.notnull(df), None).to_dict(orient='records')
+            # Replace NaNs with None; only blocks that actually contain NaN are upcast
+            # to object, instead of copying the whole chunk with astype(object)
+            # Imported rows are historical applications; set their status once per chunk
+            # rather than per row dict
+            df_dict = df.replace({np.nan: None}).assign(application_status="approved").to_dict(orient='records')
             
             for row in df_dict:
                 # Ensure essential fields exist (if they are missing, we might skip or allow partial)
                 if not row:
                     continue
                 
-                # Set default status
-                row["application_status"] = "approved"
                 app_data_list.append(row)
             
             if not app_data_list:
@@ -154,18 +162,18 @@ async def import_csv_data(
 
             # Bulk Insert LoanApplications
             # We use Core Insert to handle dynamic columns and RETURNING to get IDs
-            metadata = MetaData()
-            table = Table('loan_applications', metadata, autoload_with=db.get_bind())
-            
             try:
-                # Try using RETURNING clause (Postgres, SQLite 3.35+)
-                stmt = table.insert().values(app_data_list).returning(table.c.id)
-                result = db.execute(stmt)
-                new_ids = result.scalars().all()
+                if use_copy:
+                    # PostgreSQL: stream the chunk with COPY, IDs reserved from the sequence
+                    new_ids = crud.copy_loan_applications(db, app_data_list, table)
+                else:
+                    new_ids = crud.bulk_create_loan_applications(db, app_data_list, commit=False)
                 
                 # If we got IDs, create Predictions
                 if new_ids and len(new_ids) == len(app_data_list):
                     pred_data_list = []
+                    # One feedback timestamp for the whole chunk
+                    feedback_date = datetime.now(timezone.utc)
                     
                     for idx, app_data in enumerate(app_data_list):
                         app_id = new_ids[idx]
@@ -185,9 +193,7 @@ async def import_csv_data(
                                 actual_outcome = 1 if str(loan_status).lower() in ['y', 'yes', '1', 'true'] else 0
                         
                         # Exclude target columns from input_features (they should not be used as features)
-                        # Target columns: loan_status, loan_status_num, default, target, label, outcome
-                        target_columns = {"loan_status", "loan_status_num", "default", "target", "label", "outcome"}
-                        input_features = {k: v for k, v in app_data.items() if k not in target_columns}
+                        input_features = {k: v for k, v in app_data.items() if k not in TARGET_COLUMNS}
                         
                         pred_data = {
                             "application_id": app_id,
@@ -197,14 +203,18 @@ async def import_csv_data(
                             "binary_prediction": actual_outcome,
                             "model_type": "historical_import",
                             "actual_outcome": actual_outcome,
-                            "feedback_date": pd.Timestamp.now(),
+                            "feedback_date": feedback_date,
                         }
                         pred_data_list.append(pred_data)
                     
-                    if pred_data_list:
-                        db.execute(models.Prediction.__table__.insert(), pred_data_list)
+                    # Committed together with the chunk's applications below
+                    if use_copy:
+                        crud.copy_predictions(db, pred_data_list)
+                    else:
+                        crud.bulk_create_predictions(db, pred_data_list, commit=False)
                 
                 db.commit()
+                crud.invalidate_statistics_cache()
                 imported_count += len(app_data_list)
                 logger.info(f"Imported chunk of {len(app_data_list)} rows. Total: {imported_count}")
 
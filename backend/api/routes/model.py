@@ -1,10 +1,15 @@
-import json
 import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from anyio import to_thread
+from fastapi import APIRouter, HTTPException, Response
 
-from backend.models.dynamic_predictor import DynamicCreditRiskPredictor
-from backend.models.predictor import CreditRiskPredictor
+from backend.core.config import MODELS_DIR
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -17,6 +22,20 @@ and API endpoints for model health checks and reloading.
 """
 
 
+# Health responses only have two possible bodies, so serialize them once
+HEALTH_OK_BODY = orjson.dumps({"status": "ok", "message": "API is running and model is ready."})
+HEALTH_ERROR_BODY = orjson.dumps(
+    {
+        "status": "error",
+        "message": "Model not loaded. Service unavailable.",
+        "load_error": "Model failed to load during startup. Check logs for details.",
+    }
+)
+
+# Sentinel for ModelManager._shap_pos_idx before a warm-up has inspected the explainer output
+SHAP_LAYOUT_UNKNOWN = -1
+
+
 class ModelManager:
     """
     Singleton manager for credit risk prediction models.
@@ -26,121 +45,215 @@ class ModelManager:
     """
     _predictor = None
     _dynamic_predictor = None
+    # Positive-class index into SHAP output for explainers that return one array per class
+    # (None for a single array); SHAP_LAYOUT_UNKNOWN until a warm-up has inspected it
+    _shap_pos_idx = SHAP_LAYOUT_UNKNOWN
+    # Serialized /health body, swapped whenever the primary predictor is (re)loaded
+    _health_body = HEALTH_ERROR_BODY
+    # The dynamic predictor (imputer + historical data + its own model copy) is built on
+    # first use of a dynamic endpoint rather than at startup
+    _dynamic_failed = False
+    _dynamic_lock = threading.Lock()
+    # Serializes load_models so concurrent reload requests don't build models in parallel
+    _reload_lock = threading.Lock()
 
     @classmethod
     def get_predictor(cls):
         return cls._predictor
 
+    @classmethod
+    def get_health_body(cls) -> bytes:
+        return cls._health_body
+
     @classmethod
     def get_dynamic_predictor(cls):
+        if cls._dynamic_predictor is None and not cls._dynamic_failed:
+            with cls._dynamic_lock:
+                if cls._dynamic_predictor is None and not cls._dynamic_failed:
+                    cls._load_dynamic_predictor()
         return cls._dynamic_predictor
 
     @classmethod
-    def load_models(cls):
-        try:
-            cls._predictor = CreditRiskPredictor()
-            logger.info("CreditRiskPredictor loaded successfully.")
-        except Exception as e:
-            logger.error(f"FATAL: Model loading failed. Prediction API will be disabled. Error: {e}")
-            cls._predictor = None
+    def is_dynamic_loaded(cls) -> bool:
+        """Whether the dynamic predictor has been built, without building it."""
+        return cls._dynamic_predictor is not None
+
+    @classmethod
+    def get_dynamic_status(cls) -> str:
+        """"loaded", "failed" (last build attempt failed) or "not_loaded" (not built yet)."""
+        if cls._dynamic_predictor is not None:
+            return "loaded"
+        return "failed" if cls._dynamic_failed else "not_loaded"
+
+    @classmethod
+    def _build_dynamic_predictor(cls):
+        """Construct and warm up a DynamicCreditRiskPredictor; returns None on failure."""
+        from backend.models.dynamic_predictor import DynamicCreditRiskPredictor
 
         try:
-            cls._dynamic_predictor = DynamicCreditRiskPredictor()
+            dynamic_predictor = DynamicCreditRiskPredictor()
             logger.info("DynamicCreditRiskPredictor loaded successfully.")
         except Exception as e:
             logger.warning(f"Dynamic predictor initialization failed: {e}")
-            cls._dynamic_predictor = None
+            return None
+        cls._warm_up(dynamic_predictor.predictor, "DynamicCreditRiskPredictor")
+        return dynamic_predictor
+
+    @classmethod
+    def _load_dynamic_predictor(cls):
+        cls._dynamic_predictor = cls._build_dynamic_predictor()
+        cls._dynamic_failed = cls._dynamic_predictor is None
+        _invalidate_model_state_cache()
+
+    @classmethod
+    def get_shap_pos_idx(cls):
+        return cls._shap_pos_idx
+
+    @classmethod
+    def _warm_up(cls, predictor, name: str) -> None:
+        """
+        Run one throwaway prediction and SHAP pass so the first real request does not pay
+        for model/explainer initialization. Failures are logged and otherwise ignored.
+        """
+        start = time.perf_counter()
+        try:
+            row = dict.fromkeys(predictor.feature_names, 0)
+            predictor.predict(row, flag_threshold=0.6)
+            shap_values, _, _ = predictor.get_shap_values(row)
+            # The output layout is fixed for a loaded model, so record it once here
+            cls._shap_pos_idx = 1 if isinstance(shap_values, list) else None
+            logger.info(f"{name} warmed up in {(time.perf_counter() - start) * 1000:.1f} ms")
+        except Exception as e:
+            logger.warning(f"{name} warm-up failed: {e}")
+
+    @classmethod
+    def load_models(cls) -> bool:
+        """
+        Load (or reload) the models and return whether the primary model is available.
+
+        Replacements are fully built and warmed up before being swapped in, so in-flight
+        requests keep using the previous instances and a failed reload leaves the
+        previously loaded model serving.
+        """
+        # Imported here so the ML stack (xgboost/sklearn via joblib) is only pulled in
+        # when models are actually loaded, not whenever the routes module is imported
+        from backend.models.predictor import CreditRiskPredictor
+
+        with cls._reload_lock:
+            try:
+                new_predictor = CreditRiskPredictor()
+                logger.info("CreditRiskPredictor loaded successfully.")
+            except Exception as e:
+                if cls._predictor is None:
+                    logger.error(f"FATAL: Model loading failed. Prediction API will be disabled. Error: {e}")
+                else:
+                    logger.error(f"Model reload failed; keeping the currently loaded model. Error: {e}")
+                return False
+
+            cls._warm_up(new_predictor, "CreditRiskPredictor")
+            cls._predictor = new_predictor
+            cls._health_body = HEALTH_OK_BODY
+
+            # A dynamic predictor already in use is rebuilt and swapped the same way; if none
+            # was built yet it stays lazy. A failed rebuild keeps the previous instance serving.
+            if cls._dynamic_predictor is not None:
+                new_dynamic = cls._build_dynamic_predictor()
+                if new_dynamic is None:
+                    logger.error("Dynamic predictor reload failed; keeping the currently loaded instance.")
+                else:
+                    with cls._dynamic_lock:
+                        cls._dynamic_predictor = new_dynamic
+                        cls._dynamic_failed = False
+            else:
+                # Retry a previously failed lazy build against the new artifacts
+                with cls._dynamic_lock:
+                    cls._dynamic_failed = False
+
+            _invalidate_model_state_cache()
+            return True
 
     @classmethod
     def reload_models(cls):
         logger.info("Reloading models...")
-        cls.load_models()
+        if not cls.load_models():
+            raise RuntimeError("Model artifacts could not be loaded; the previously loaded model is still serving.")
         return True
 
 
 
 
 @router.get("/health")
-def health_check():
+async def health_check():
     """Check if the API is running and the model is loaded."""
-    predictor = ModelManager.get_predictor()
-    if predictor is None:
-        error_msg = "Model not loaded. Service unavailable."
-        return {
-            "status": "error",
-            "message": error_msg,
-            "load_error": "Model failed to load during startup. Check logs for details.",
-        }
-    return {"status": "ok", "message": "API is running and model is ready."}
+    return Response(content=ModelManager.get_health_body(), media_type="application/json")
 
 
 @router.get("/model/health")
-def model_health():
+async def model_health():
     """
     Alias endpoint for model health used by the admin panel.
 
     This keeps backwards compatibility with /health while exposing
     a namespaced /model/health endpoint under /api/v1.
     """
-    return health_check()
+    return await health_check()
+
+
+# Artifact paths reported by /state, resolved once instead of per request
+MODEL_FILE_PATHS = {
+    "model": MODELS_DIR / "credit_risk_model.pkl",
+    "scaler": MODELS_DIR / "scaler.pkl",
+    "features": MODELS_DIR / "feature_names.json",
+}
+MANIFEST_PATH = MODELS_DIR / "manifest.json"
+
+# The admin panel polls /state; a short TTL keeps that cheap while still reflecting
+# retraining within a couple of seconds (reloads invalidate it immediately)
+MODEL_STATE_CACHE_TTL_SECONDS = 2.0
+_model_state_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def _invalidate_model_state_cache() -> None:
+    global _model_state_cache
+    _model_state_cache = None
+
+
+def _file_info(path: Path) -> Dict[str, Any]:
+    # One stat() gives existence, size and mtime together
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {"exists": False}
+    return {"exists": True, "size": st.st_size, "modified": st.st_mtime}
 
 
 @router.get("/state")
 def get_model_state():
     """Get detailed model state information."""
-    import os
-    from backend.core.config import MODELS_DIR
-    
+    global _model_state_cache
+
+    now = time.monotonic()
+    cached = _model_state_cache
+    if cached is not None and now - cached[0] < MODEL_STATE_CACHE_TTL_SECONDS:
+        return cached[1]
+
     predictor = ModelManager.get_predictor()
-    dynamic_predictor = ModelManager.get_dynamic_predictor()
     
     state = {
         "predictor_loaded": predictor is not None,
-        "dynamic_predictor_loaded": dynamic_predictor is not None,
-        "model_files": {},
+        # Reported without building it; the dynamic predictor loads on first dynamic request
+        "dynamic_predictor_loaded": ModelManager.is_dynamic_loaded(),
+        "dynamic_predictor_status": ModelManager.get_dynamic_status(),
+        "model_files": {name: _file_info(path) for name, path in MODEL_FILE_PATHS.items()},
         "manifest": None
     }
     
-    # Check model files in the configured models directory
-    model_path = MODELS_DIR / "credit_risk_model.pkl"
-    scaler_path = MODELS_DIR / "scaler.pkl"
-    features_path = MODELS_DIR / "feature_names.json"
-    manifest_path = MODELS_DIR / "manifest.json"
-    
-    if model_path.exists():
-        state["model_files"]["model"] = {
-            "exists": True,
-            "size": os.path.getsize(model_path),
-            "modified": os.path.getmtime(model_path)
-        }
-    else:
-        state["model_files"]["model"] = {"exists": False}
-    
-    if scaler_path.exists():
-        state["model_files"]["scaler"] = {
-            "exists": True,
-            "size": os.path.getsize(scaler_path),
-            "modified": os.path.getmtime(scaler_path)
-        }
-    else:
-        state["model_files"]["scaler"] = {"exists": False}
-    
-    if features_path.exists():
-        state["model_files"]["features"] = {
-            "exists": True,
-            "size": os.path.getsize(features_path),
-            "modified": os.path.getmtime(features_path)
-        }
-    else:
-        state["model_files"]["features"] = {"exists": False}
-    
     # Load manifest if exists
-    if manifest_path.exists():
+    if MANIFEST_PATH.exists():
         try:
-            with open(manifest_path, "r", encoding="utf-8") as f:
-                manifest = json.load(f)
-                if isinstance(manifest, list) and len(manifest) > 0:
-                    state["manifest"] = manifest[-1]  # Latest entry
+            manifest = orjson.loads(MANIFEST_PATH.read_bytes())
+            if isinstance(manifest, list) and len(manifest) > 0:
+                state["manifest"] = manifest[-1]  # Latest entry
         except Exception as e:
             logger.warning(f"Failed to load manifest: {e}")
     
@@ -154,6 +267,7 @@ def get_model_state():
             "load_error": predictor.load_error
         }
     
+    _model_state_cache = (now, state)
     return state
 
 
@@ -168,10 +282,11 @@ def get_model_state_alias():
 
 
 @router.post("/reload_model")
-def reload_model():
+async def reload_model():
     """Reload the model from disk. Useful after retraining or fixing model files."""
     try:
-        ModelManager.reload_models()
+        # Model loading is blocking disk/CPU work; keep it off the event loop
+        await to_thread.run_sync(ModelManager.reload_models)
         return {"status": "success", "message": "Model reloaded successfully."}
     except Exception as e:
         logger.error(f"Model reload failed: {e}", exc_info=True)
@@ -179,10 +294,10 @@ def reload_model():
 
 
 @router.post("/model/reload")
-def reload_model_alias():
+async def reload_model_alias():
     """
     Alias endpoint for model reload used by the admin panel.
 
     Exposes /api/v1/model/reload while reusing the core implementation.
     """
-    return reload_model()
+    return await reload_model()
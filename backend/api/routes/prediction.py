@@ -1,25 +1,74 @@
-import json
+import asyncio
+import heapq
 import logging
 import os
 import time
-from typing import Any, Dict, List
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from anyio import to_thread
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from backend.api.routes.model import ModelManager
+from backend.api.routes.model import MANIFEST_PATH, SHAP_LAYOUT_UNKNOWN, ModelManager
 from backend.core.schemas import LoanApplication
 from backend.database import crud
-from backend.database.config import get_db
-from backend.services.imputation import DynamicLoanApplication
+from backend.database.config import SessionLocal
+from backend.services.imputation import TARGET_COLUMNS, DynamicLoanApplication
 from backend.utils.ai_client import get_ai_client
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+# ==================== LLM Explanation Cache ====================
+
+# The explanation text may quote anything in the prompt (risk level, SHAP values and the raw
+# applicant data), so entries are keyed on the full prompt: only an identical request, such as
+# the same CSV row re-submitted, reuses earlier text instead of another LLM round trip. Only
+# successful generations are cached.
+LLM_CACHE_TTL_SECONDS = 3600.0
+LLM_CACHE_MAX_ENTRIES = 2048
+
+_llm_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _llm_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    entry = _llm_cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] >= LLM_CACHE_TTL_SECONDS:
+        del _llm_cache[key]
+        return None
+    _llm_cache.move_to_end(key)
+    return dict(entry[1])
+
+
+def _llm_cache_put(key: str, explanation: Dict[str, Any]) -> None:
+    _llm_cache[key] = (time.monotonic(), dict(explanation))
+    _llm_cache.move_to_end(key)
+    while len(_llm_cache) > LLM_CACHE_MAX_ENTRIES:
+        _llm_cache.popitem(last=False)
+
+
+# The instructions never change, so they lead the prompt and only the applicant-specific block
+# at the end varies; providers that cache prompt prefixes can then reuse them across requests
+LLM_EXPLANATION_SYSTEM_PROMPT = (
+    "You are a friendly, expert financial analyst explaining complex risk to a non-expert."
+)
+LLM_EXPLANATION_INSTRUCTIONS = """
+        You are an expert Credit Risk Analyst. Explain the decision for this loan application
+        in a concise, single paragraph suitable for a bank client.
+        Focus on summarizing *why* the loan was approved or rejected based on the factors below.
+"""
+
+
 # Helper function for generating LLM explanations
 async def generate_llm_explanation(
     input_data: Dict[str, Any],
@@ -28,23 +77,23 @@ async def generate_llm_explanation(
 ) -> Dict[str, Any]:
     """Generate AI-powered explanation for credit risk decision."""
     try:
-        shap_series = pd.Series(shap_explanation).sort_values(key=abs, ascending=False).head(5)
-        
-        prompt = f"""
-        You are an expert Credit Risk Analyst. Explain the decision for this loan application
-        in a concise, single paragraph suitable for a bank client.
+        top_items = heapq.nlargest(5, shap_explanation.items(), key=lambda kv: abs(kv[1]))
+        top_features = dict(top_items)
 
+        prompt = f"""{LLM_EXPLANATION_INSTRUCTIONS}
         The predicted outcome is: {risk_level}.
 
         The top 5 most impactful features (SHAP values) contributing to this decision are:
-        {shap_series.to_dict()}
+        {top_features}
 
         The raw applicant data is: {input_data}
-
-        Focus on summarizing *why* the loan was approved or rejected based on these factors.
         """
-        
-        system_prompt = "You are a friendly, expert financial analyst explaining complex risk to a non-expert."
+
+        cached = _llm_cache_get(prompt)
+        if cached is not None:
+            logger.debug("Serving LLM explanation from cache")
+            cached["cache_hit"] = True
+            return cached
         
         ai_client = get_ai_client()
         
@@ -58,7 +107,7 @@ async def generate_llm_explanation(
         
         logger.info("Generating LLM explanation...")
         
-        result = await ai_client.generate_with_retry(prompt, system_prompt)
+        result = await ai_client.generate_with_retry(prompt, LLM_EXPLANATION_SYSTEM_PROMPT)
         
         if result.get("error"):
             error_type = result.get("error")
@@ -82,11 +131,14 @@ async def generate_llm_explanation(
             }
         
         logger.info(f"LLM explanation generated successfully ({len(text)} characters)")
-        return {
+        explanation = {
             "text": text,
             "remediation_suggestion": None,  # Can be enhanced later
-            "raw": result.get("raw", "")
+            "raw": result.get("raw", ""),
+            "cache_hit": False,
         }
+        _llm_cache_put(prompt, explanation)
+        return explanation
         
     except Exception as e:
         logger.error(f"Error generating LLM explanation: {e}")
@@ -104,35 +156,78 @@ try:
     
     stats_path = PROJECT_ROOT / "models" / "feature_statistics.json"
     if stats_path.exists():
-        with open(stats_path, "r", encoding="utf-8") as sf:
-            FEATURE_STATS = json.load(sf)
+        FEATURE_STATS = orjson.loads(stats_path.read_bytes())
         logger.info(f"Loaded feature statistics from: {stats_path}")
 except Exception as e:
     logger.warning(f"Could not load feature statistics: {e}")
     FEATURE_STATS = {}
 
 
-def _get_model_version() -> str:
-    """Get the current model version from manifest."""
+def _stat_array(key: str) -> np.ndarray:
+    """Align one statistic across FEATURE_STATS; missing or non-numeric entries become NaN."""
+    values = []
+    for stats in FEATURE_STATS.values():
+        try:
+            values.append(float(stats.get(key)))
+        except (TypeError, ValueError, AttributeError):
+            values.append(np.nan)
+    return np.array(values, dtype=np.float64)
+
+
+# Drift bounds aligned with _DRIFT_FEATURES so _check_drift compares all features in one pass.
+# NaN bounds never compare true, which mirrors the "stat missing" branches of the scalar check.
+_DRIFT_FEATURES: List[str] = list(FEATURE_STATS)
+_DRIFT_KEYS = frozenset(_DRIFT_FEATURES)
+_DRIFT_MINS = _stat_array("min")
+_DRIFT_MAXS = _stat_array("max")
+_DRIFT_MEANS = _stat_array("mean")
+_DRIFT_STDS = _stat_array("std")
+_DRIFT_LOWER = _DRIFT_MEANS - 3 * _DRIFT_STDS
+_DRIFT_UPPER = _DRIFT_MEANS + 3 * _DRIFT_STDS
+_DRIFT_HAS_RANGE = ~(np.isnan(_DRIFT_MINS) | np.isnan(_DRIFT_MAXS))
+_DRIFT_SIGMA_OK = _DRIFT_STDS >= 0
+
+
+# The manifest only changes when a model is retrained, so stored predictions reuse the parsed
+# version until the file's mtime changes; (mtime_ns, version)
+_model_version_cache: Optional[Tuple[int, str]] = None
+
+
+def _read_model_version() -> str:
+    """Read the current model version from the manifest."""
     try:
-        from pathlib import Path
-        from backend.core.config import PROJECT_ROOT
-        
-        manifest_path = PROJECT_ROOT / "models" / "manifest.json"
-        if manifest_path.exists():
-            with open(manifest_path, "r", encoding="utf-8") as f:
-                manifest = json.load(f)
-                if isinstance(manifest, list) and len(manifest) > 0:
-                    # Get the latest version
-                    latest = manifest[-1]
-                    return latest.get("version") or latest.get("model_version") or "unknown"
-                elif isinstance(manifest, dict):
-                    return manifest.get("version") or manifest.get("model_version") or "unknown"
+        if MANIFEST_PATH.exists():
+            manifest = orjson.loads(MANIFEST_PATH.read_bytes())
+            if isinstance(manifest, list) and len(manifest) > 0:
+                # Get the latest version
+                latest = manifest[-1]
+                return latest.get("version") or latest.get("model_version") or "unknown"
+            elif isinstance(manifest, dict):
+                return manifest.get("version") or manifest.get("model_version") or "unknown"
     except Exception as e:
         logger.warning(f"Could not get model version: {e}")
     return "unknown"
 
 
+def _get_model_version() -> str:
+    """Get the current model version from manifest."""
+    global _model_version_cache
+
+    # A stat() is far cheaper than reading and parsing the manifest
+    try:
+        mtime_ns = os.stat(MANIFEST_PATH).st_mtime_ns
+    except OSError:
+        return "unknown"
+
+    cached = _model_version_cache
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    version = _read_model_version()
+    _model_version_cache = (mtime_ns, version)
+    return version
+
+
 def _store_prediction_to_db(
     db: Session,
     input_features: Dict[str, Any],
@@ -161,9 +256,12 @@ def _store_prediction_to_db(
         prediction_time_ms: Prediction time in milliseconds (optional)
     """
     try:
-        # Exclude target columns from input_features (they should not be used as features)
-        target_columns = {"loan_status", "loan_status_num", "default", "target", "label", "outcome"}
-        clean_features = {k: v for k, v in input_features.items() if k not in target_columns}
+        # Exclude target columns from input_features (they should not be used as features);
+        # the common case has none, so skip the copy
+        if TARGET_COLUMNS.isdisjoint(input_features):
+            clean_features = input_features
+        else:
+            clean_features = {k: v for k, v in input_features.items() if k not in TARGET_COLUMNS}
         
         model_version = _get_model_version()
         
@@ -187,12 +285,144 @@ def _store_prediction_to_db(
         logger.warning(f"Failed to store prediction to database: {e}")
 
 
-@router.post("/predict_risk", response_model=Dict[str, Any])
-async def predict_risk(application: LoanApplication, db: Session = Depends(get_db)):
+def _store_prediction_in_background(**prediction_fields: Any) -> None:
+    """
+    BackgroundTasks entry point for _store_prediction_to_db. The request's session may already
+    be closed when background tasks run, so the write uses its own session.
+    """
+    db = SessionLocal()
+    try:
+        _store_prediction_to_db(db=db, **prediction_fields)
+    finally:
+        db.close()
+
+
+def _application_fields(application: BaseModel) -> Dict[str, Any]:
+    """
+    Raw field values of a request model. The loan application schemas are flat models of
+    scalar fields (no aliases, nested models or serializers), so a shallow copy of the
+    validated values, plus any extra fields, equals model_dump() without the serializer pass.
+    """
+    fields = dict(application.__dict__)
+    if application.__pydantic_extra__:
+        fields.update(application.__pydantic_extra__)
+    return fields
+
+
+# LoanApplication fields passed straight through, and categorical fields with their one-hot prefix
+_NUMERIC_INPUT_FIELDS = (
+    "person_age",
+    "person_income",
+    "person_emp_length",
+    "loan_amnt",
+    "loan_int_rate",
+    "loan_percent_income",
+    "cb_person_cred_hist_length",
+)
+_ONE_HOT_INPUT_FIELDS = (
+    ("home_ownership", "person_home_ownership_"),
+    ("loan_intent", "loan_intent_"),
+    ("loan_grade", "loan_grade_"),
+    ("default_on_file", "cb_person_default_on_file_"),
+)
+
+# (feature_names, numeric (field, column index) pairs, per-field {category: column index} maps)
+# for the loaded model, swapped as one tuple and rebuilt only when a reload brings a different
+# feature_names list
+_input_template: Tuple[Any, Tuple[Tuple[str, int], ...], Tuple[Tuple[str, Dict[str, int]], ...]] = (None, (), ())
+
+
+def _build_input_template(feature_names: List[str]):
+    index = {name: i for i, name in enumerate(feature_names)}
+    numeric = tuple((field, index[field]) for field in _NUMERIC_INPUT_FIELDS if field in index)
+    one_hot_keys = []
+    for field, prefix in _ONE_HOT_INPUT_FIELDS:
+        # e.g. {"RENT": <index of person_home_ownership_RENT>, ...}; no f-string formatting per request
+        keys = {name[len(prefix):]: i for name, i in index.items() if name.startswith(prefix)}
+        one_hot_keys.append((field, keys))
+    return feature_names, numeric, tuple(one_hot_keys)
+
+
+def _build_predictor_input(raw_input_dict: Dict[str, Any], feature_names: List[str]) -> np.ndarray:
+    """Map a LoanApplication dump onto one raw model input row (columns in feature_names order)."""
+    global _input_template
+
+    template = _input_template
+    if template[0] is not feature_names:
+        template = _input_template = _build_input_template(feature_names)
+    _, numeric, one_hot_keys = template
+
+    row = np.zeros(len(feature_names), dtype=np.float64)
+    for field, i in numeric:
+        row[i] = raw_input_dict[field]
+    for field, keys in one_hot_keys:
+        # Baseline categories (dropped during training) have no column and stay all-zero
+        i = keys.get(raw_input_dict[field])
+        if i is not None:
+            row[i] = 1.0
+    return row
+
+
+def _positive_class_shap(shap_values) -> np.ndarray:
+    """SHAP output for the positive (default) class; some explainers return one array per class."""
+    pos_idx = ModelManager.get_shap_pos_idx()
+    if pos_idx == SHAP_LAYOUT_UNKNOWN:
+        # Warm-up did not run (or failed); inspect this output instead
+        pos_idx = 1 if isinstance(shap_values, list) else None
+    if pos_idx is not None:
+        shap_values = shap_values[pos_idx]
+    return np.asarray(shap_values, dtype=np.float64)
+
+
+def _shap_to_dict(shap_values, feature_names: List[str]) -> Dict[str, float]:
+    """Map a single row of SHAP values onto feature names."""
+    row = _positive_class_shap(shap_values).reshape(-1)
+    if len(feature_names) != row.size:
+        logger.warning(
+            "SHAP feature count (%s) != feature_names count (%s). Truncating to min length.", row.size, len(feature_names)
+        )
+    # .tolist() already yields native floats, so no per-element float() is needed
+    return dict(zip(feature_names, row.tolist()))
+
+
+def _predict_with_shap(
+    predictor, input_row: np.ndarray, explain: bool = True
+) -> Tuple[str, float, int, Dict[str, float]]:
+    """Run prediction and (if explain) SHAP for /predict_risk. Blocking; called through a worker thread."""
+    # Scale once; the same matrix feeds the model and the explainer
+    scaled_features = predictor.preprocess_array(input_row)
+
+    # Get prediction
+    risk_level, prob, pred = predictor.predict_prepared(scaled_features, flag_threshold=0.6)[0]
+    if not explain:
+        return risk_level, prob, pred, {}
+
+    # Get SHAP values
+    shap_values, _ = predictor.get_shap_values_from_prepared(scaled_features)
+
+    # Format SHAP data
+    shap_explanation = _shap_to_dict(shap_values, predictor.feature_names)
+    return risk_level, prob, pred, shap_explanation
+
+
+def _dynamic_shap_explanation(dynamic_predictor, scaled_features) -> Dict[str, float]:
+    """
+    SHAP explanation for /predict_risk_dynamic from the features predict() already scaled.
+    Blocking; called through a worker thread.
+    """
+    shap_values, _ = dynamic_predictor.get_shap_values_from_prepared(scaled_features)
+    return _shap_to_dict(shap_values, dynamic_predictor.predictor.feature_names)
+
+
+@router.post("/predict_risk", response_class=ORJSONResponse)
+async def predict_risk(application: LoanApplication, background_tasks: BackgroundTasks, explain: bool = True):
     """
     Accepts complete loan application data and returns a credit risk prediction, probability,
     SHAP explanation, and AI-generated advice.
 
+    Pass explain=false for screening workloads: SHAP and the LLM call (the bulk of the
+    per-request cost) are skipped, returning an empty shap_explanation and no llm_explanation.
+
     Note: For CSV uploads and partial data, use /predict_risk_dynamic or /predict_risk_batch instead.
     """
     predictor = ModelManager.get_predictor()
@@ -202,92 +432,72 @@ async def predict_risk(application: LoanApplication, db: Session = Depends(get_d
         )
 
     # Convert Pydantic model to a raw dictionary
-    raw_input_dict = application.model_dump()
-
-    # --- Data drift check ---
-    drift_warnings = _check_drift(raw_input_dict)
-
-    # --- Prepare Input Dictionary ---
-    input_dict_for_predictor = {
-        "person_age": raw_input_dict["person_age"],
-        "person_income": raw_input_dict["person_income"],
-        "person_emp_length": raw_input_dict["person_emp_length"],
-        "loan_amnt": raw_input_dict["loan_amnt"],
-        "loan_int_rate": raw_input_dict["loan_int_rate"],
-        "loan_percent_income": raw_input_dict["loan_percent_income"],
-        "cb_person_cred_hist_length": raw_input_dict["cb_person_cred_hist_length"],
-        f"person_home_ownership_{raw_input_dict['home_ownership']}": 1,
-        f"loan_intent_{raw_input_dict['loan_intent']}": 1,
-        f"loan_grade_{raw_input_dict['loan_grade']}": 1,
-        f"cb_person_default_on_file_{raw_input_dict['default_on_file']}": 1,
-    }
-
-    try:
-        # Get prediction
-        risk_level, prob, pred = predictor.predict(input_dict_for_predictor, flag_threshold=0.6)
-
-        # Get SHAP values
-        shap_values, expected_value, df_features = predictor.get_shap_values(input_dict_for_predictor)
+    raw_input_dict = _application_fields(application)
 
-        # Format SHAP data
-        feature_names = df_features.columns.tolist()
+    # --- Prepare Input Row ---
+    input_row = _build_predictor_input(raw_input_dict, predictor.feature_names)
 
-        if isinstance(shap_values, list):
-            shap_data = shap_values[1]
-        else:
-            shap_data = shap_values
-
-        try:
-            row = shap_data.tolist()[0]
-        except Exception:
-            row = np.asarray(shap_data).ravel().tolist()
-
-        if len(feature_names) != len(row):
-            logger.warning(
-                "SHAP feature count (%s) != feature_names count (%s). Truncating to min length.", len(row), len(feature_names)
-            )
+    # Model + SHAP are CPU-bound; run them in a worker thread (they release the GIL in
+    # compiled code) and do the drift check on the event loop in the meantime
+    model_task = asyncio.create_task(
+        to_thread.run_sync(_predict_with_shap, predictor, input_row, explain)
+    )
 
-        shap_explanation = {k: float(v) for k, v in zip(feature_names, row)}
+    # --- Data drift check ---
+    drift_records = _check_drift(raw_input_dict)
 
+    try:
+        risk_level, prob, pred, shap_explanation = await model_task
     except Exception as e:
         logger.error(f"Prediction or SHAP calculation failed: {e}")
         raise HTTPException(status_code=500, detail={"status": "error", "message": f"Internal prediction error: {str(e)}"})
 
     # --- Generate LLM Explanation ---
-    llm_result = await generate_llm_explanation(
-        input_data=raw_input_dict,
-        shap_explanation=shap_explanation,
-        risk_level=risk_level,
-    )
-    llm_explanation = llm_result.get("text") if isinstance(llm_result, dict) else str(llm_result)
-    remediation_suggestion = None
-    if isinstance(llm_result, dict):
-        remediation_suggestion = llm_result.get("remediation_suggestion")
+    # Start the network-bound LLM call first and format the drift notes while it is in flight
+    llm_task = None
+    if explain:
+        llm_task = asyncio.create_task(
+            generate_llm_explanation(
+                input_data=raw_input_dict,
+                shap_explanation=shap_explanation,
+                risk_level=risk_level,
+            )
+        )
+
+    drift_warnings = _format_drift(drift_records) if drift_records else []
 
     # Prepare operational notes
     operational_notes = ""
     if drift_warnings:
         operational_notes = "Data drift warnings detected: " + "; ".join(drift_warnings) + ". Please review input data."
 
+    llm_explanation = None
+    remediation_suggestion = None
+    if llm_task is not None:
+        llm_result = await llm_task
+        llm_explanation = llm_result.get("text") if isinstance(llm_result, dict) else str(llm_result)
+        if isinstance(llm_result, dict):
+            remediation_suggestion = llm_result.get("remediation_suggestion")
+
     # Store prediction to database for future retraining
-    try:
-        _store_prediction_to_db(
-            db=db,
-            input_features=raw_input_dict,
-            risk_level=risk_level,
-            probability_default=prob,
-            binary_prediction=pred,
-            model_type="traditional",
-            shap_explanation=shap_explanation,
-            llm_explanation=llm_explanation,
-            remediation_suggestion=remediation_suggestion,
-        )
-    except Exception as e:
-        logger.warning(f"Failed to store prediction to database: {e}")
+    # (after the response is sent; the client doesn't need to wait for the INSERT)
+    background_tasks.add_task(
+        _store_prediction_in_background,
+        input_features=raw_input_dict,
+        risk_level=risk_level,
+        probability_default=prob,
+        binary_prediction=pred,
+        model_type="traditional",
+        shap_explanation=shap_explanation or None,
+        llm_explanation=llm_explanation,
+        remediation_suggestion=remediation_suggestion,
+    )
 
-    return {
+    # Returned as a Response so FastAPI skips its jsonable_encoder pass; every value here is
+    # already a native type (or a numpy scalar, which orjson serializes)
+    return ORJSONResponse({
         "status": "success",
-        "timestamp": pd.Timestamp.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
         "risk_level": risk_level,
         "probability_default_percent": round(prob * 100, 2),
         "binary_prediction": pred,
@@ -298,14 +508,25 @@ async def predict_risk(application: LoanApplication, db: Session = Depends(get_d
         "remediation_suggestion": remediation_suggestion,
         "data_drift_warnings": drift_warnings,
         "operational_notes": operational_notes,
-    }
+    })
 
 
-@router.post("/predict_risk_dynamic", response_model=Dict[str, Any])
+async def _get_dynamic_predictor():
+    """
+    The dynamic predictor, building it in a worker thread on first use: the artifact load and
+    SHAP warm-up would otherwise block the event loop (and every other request) meanwhile.
+    """
+    if ModelManager.is_dynamic_loaded():
+        return ModelManager.get_dynamic_predictor()
+    return await to_thread.run_sync(ModelManager.get_dynamic_predictor)
+
+
+@router.post("/predict_risk_dynamic", response_class=ORJSONResponse)
 async def predict_risk_dynamic(
-    application: DynamicLoanApplication, 
+    application: DynamicLoanApplication,
+    background_tasks: BackgroundTasks,
     include_llm: bool = True,
-    db: Session = Depends(get_db)
+    explain: bool = True,
 ):
     """
     Primary prediction endpoint for CSV uploads and flexible data input.
@@ -313,59 +534,61 @@ async def predict_risk_dynamic(
     Args:
         application: Loan application data
         include_llm: Whether to generate LLM explanation (default: True). Set to False for batch processing to save tokens.
+        explain: Whether to compute SHAP values (default: True). Set to False for fast screening; this also
+            skips the LLM explanation, since SHAP computation dominates the per-request cost.
     """
-    dynamic_predictor = ModelManager.get_dynamic_predictor()
+    dynamic_predictor = await _get_dynamic_predictor()
     if dynamic_predictor is None:
         raise HTTPException(
             status_code=503, detail={"status": "error", "message": "Dynamic predictor not loaded. Cannot process prediction."}
         )
 
-    raw_input_dict = application.model_dump(exclude_none=False)
+    raw_input_dict = _application_fields(application)
 
     is_valid, validation_warnings = dynamic_predictor.validate_input(raw_input_dict)
 
     try:
-        risk_level, prob, pred, imputation_log, imputed_data = dynamic_predictor.predict(
-            raw_input_dict, flag_threshold=0.6, return_imputation_log=True
+        risk_level, prob, pred, imputation_log, imputed_data, scaled_features = await to_thread.run_sync(
+            partial(
+                dynamic_predictor.predict,
+                raw_input_dict,
+                flag_threshold=0.6,
+                return_imputation_log=True,
+                return_prepared=True,
+            )
         )
 
-        shap_values, expected_value, df_features, _ = dynamic_predictor.get_shap_values(raw_input_dict)
-
-        feature_names = df_features.columns.tolist()
-
-        if isinstance(shap_values, list):
-            shap_data = shap_values[1]
-        else:
-            shap_data = shap_values
-
-        try:
-            row = shap_data.tolist()[0]
-        except Exception:
-            row = np.asarray(shap_data).ravel().tolist()
+        # SHAP runs in a worker thread while the drift check on the imputed data runs here
+        shap_task = None
+        if explain:
+            shap_task = asyncio.create_task(
+                to_thread.run_sync(_dynamic_shap_explanation, dynamic_predictor, scaled_features)
+            )
 
-        shap_explanation = {k: float(v) for k, v in zip(feature_names, row)}
+        # Data drift check on imputed data
+        drift_records = _check_drift(imputed_data)
 
+        shap_explanation = await shap_task if shap_task is not None else {}
     except Exception as e:
         logger.error(f"Dynamic prediction failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail={"status": "error", "message": f"Prediction error: {str(e)}"})
 
-    # Data drift check on imputed data
-    drift_warnings = _check_drift(imputed_data)
-
-    # Generate LLM explanation only if requested (skip for batch processing to save tokens)
-    llm_explanation = None
-    remediation_suggestion = None
-    if include_llm:
-        llm_result = await generate_llm_explanation(
-            input_data=imputed_data,
-            shap_explanation=shap_explanation,
-            risk_level=risk_level,
+    # Generate LLM explanation only if requested (skip for batch processing to save tokens).
+    # The call is started now so note assembly overlaps with the network wait.
+    llm_task = None
+    if include_llm and explain:
+        llm_task = asyncio.create_task(
+            generate_llm_explanation(
+                input_data=imputed_data,
+                shap_explanation=shap_explanation,
+                risk_level=risk_level,
+            )
         )
-        llm_explanation = llm_result.get("text") if isinstance(llm_result, dict) else str(llm_result)
-        remediation_suggestion = llm_result.get("remediation_suggestion") if isinstance(llm_result, dict) else None
     else:
         logger.info("Skipping LLM explanation generation (batch processing mode)")
 
+    drift_warnings = _format_drift(drift_records) if drift_records else []
+
     operational_notes_parts = []
     if imputation_log:
         operational_notes_parts.append(f"Imputed {len(imputation_log)} fields: {', '.join(imputation_log[:5])}")
@@ -376,26 +599,31 @@ async def predict_risk_dynamic(
 
     operational_notes = " | ".join(operational_notes_parts) if operational_notes_parts else ""
 
+    llm_explanation = None
+    remediation_suggestion = None
+    if llm_task is not None:
+        llm_result = await llm_task
+        llm_explanation = llm_result.get("text") if isinstance(llm_result, dict) else str(llm_result)
+        remediation_suggestion = llm_result.get("remediation_suggestion") if isinstance(llm_result, dict) else None
+
     # Store prediction to database for future retraining
     # Use imputed_data (not raw_input_dict) as it has the actual features used for prediction
-    try:
-        _store_prediction_to_db(
-            db=db,
-            input_features=imputed_data,
-            risk_level=risk_level,
-            probability_default=prob,
-            binary_prediction=pred,
-            model_type="dynamic",
-            shap_explanation=shap_explanation,
-            llm_explanation=llm_explanation,
-            remediation_suggestion=remediation_suggestion,
-        )
-    except Exception as e:
-        logger.warning(f"Failed to store prediction to database: {e}")
+    # (after the response is sent; the client doesn't need to wait for the INSERT)
+    background_tasks.add_task(
+        _store_prediction_in_background,
+        input_features=imputed_data,
+        risk_level=risk_level,
+        probability_default=prob,
+        binary_prediction=pred,
+        model_type="dynamic",
+        shap_explanation=shap_explanation or None,
+        llm_explanation=llm_explanation,
+        remediation_suggestion=remediation_suggestion,
+    )
 
-    return {
+    return ORJSONResponse({
         "status": "success",
-        "timestamp": pd.Timestamp.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
         "risk_level": risk_level,
         "probability_default_percent": round(prob * 100, 2),
         "binary_prediction": pred,
@@ -409,100 +637,212 @@ async def predict_risk_dynamic(
         "remediation_suggestion": remediation_suggestion,
         "data_drift_warnings": drift_warnings,
         "operational_notes": operational_notes,
-    }
+    })
+
+
+# Upper bound on concurrent LLM calls issued by one /predict_risk_batch request
+LLM_BATCH_CONCURRENCY = 16
 
 
-@router.post("/predict_risk_batch", response_model=Dict[str, Any])
-async def predict_risk_batch(applications: List[DynamicLoanApplication], include_explanations: bool = False):
+def _predict_batch_rows(
+    dynamic_predictor, raw_rows: List[Dict[str, Any]], include_explanations: bool
+) -> Tuple[List[Dict[str, Any]], List[Tuple]]:
     """
-    Batch prediction endpoint for CSV uploads.
+    Run /predict_risk_batch's model work. Blocking; called through a worker thread.
+
+    Returns the per-row results (in input order) and, when explanations are requested,
+    (result, imputed_data, shap_explanation, risk_level) for each row still awaiting its LLM text.
     """
-    dynamic_predictor = ModelManager.get_dynamic_predictor()
-    if dynamic_predictor is None:
-        raise HTTPException(status_code=503, detail={"status": "error", "message": "Dynamic predictor not loaded."})
+    results: List[Dict[str, Any]] = [None] * len(raw_rows)
 
-    results = []
+    # Impute/map each row individually so a bad row only fails itself
+    prepared = []
+    for idx, raw_input_dict in enumerate(raw_rows):
+        try:
+            row, imputed_data, imputation_log = dynamic_predictor.prepare_row(raw_input_dict)
+            prepared.append((idx, row, imputed_data, imputation_log))
+        except Exception as e:
+            logger.error(f"Batch item {idx} failed: {e}")
+            results[idx] = {"index": idx, "status": "error", "error": str(e)}
 
-    for idx, application in enumerate(applications):
+    if not prepared:
+        return results, []
+
+    feature_rows = [item[1] for item in prepared]
+    try:
+        # Scale once and make one model call for the whole batch instead of one per row
+        scaled_features = dynamic_predictor.preprocess_array(np.vstack(feature_rows))
+        predictions = dynamic_predictor.predict_prepared(scaled_features, flag_threshold=0.6)
+    except Exception as e:
+        logger.error(f"Batch prediction failed: {e}")
+        for idx, *_ in prepared:
+            results[idx] = {"index": idx, "status": "error", "error": str(e)}
+        return results, []
+
+    shap_matrix = None
+    shap_feature_names = dynamic_predictor.predictor.feature_names
+    shap_error = None
+    if include_explanations:
         try:
-            raw_input_dict = application.model_dump(exclude_none=False)
+            # Reuses the scaled matrix from the prediction above
+            shap_values, _ = dynamic_predictor.get_shap_values_from_prepared(scaled_features)
+            shap_matrix = _positive_class_shap(shap_values).reshape(len(feature_rows), -1)
+        except Exception as e:
+            shap_error = e
+
+    explain_items = []
+    for pos, (idx, _, imputed_data, imputation_log) in enumerate(prepared):
+        risk_level, prob, pred = predictions[pos]
+        result = {
+            "index": idx,
+            "status": "success",
+            "risk_level": risk_level,
+            "probability_default_percent": round(prob * 100, 2),
+            "binary_prediction": pred,
+            "input_features": imputed_data,
+            "imputation_log": imputation_log,
+        }
+        results[idx] = result
 
-            risk_level, prob, pred, imputation_log, imputed_data = dynamic_predictor.predict(
-                raw_input_dict, flag_threshold=0.6, return_imputation_log=True
+        if include_explanations:
+            if shap_error is not None:
+                logger.warning(f"Explanation generation failed for item {idx}: {shap_error}")
+                result["explanation_error"] = str(shap_error)
+            else:
+                shap_explanation = _shap_to_dict(shap_matrix[pos], shap_feature_names)
+                explain_items.append((result, imputed_data, shap_explanation, risk_level))
+
+    return results, explain_items
+
+
+async def _explain_batch_item(semaphore: asyncio.Semaphore, item: Tuple) -> Dict[str, Any]:
+    """Fill in one batch result's LLM explanation (or explanation_error) and return the result."""
+    result, imputed_data, shap_explanation, risk_level = item
+    try:
+        async with semaphore:
+            llm_result = await generate_llm_explanation(
+                input_data=imputed_data,
+                shap_explanation=shap_explanation,
+                risk_level=risk_level,
             )
+    except Exception as e:
+        logger.warning(f"Explanation generation failed for item {result['index']}: {e}")
+        result["explanation_error"] = str(e)
+        return result
 
-            result = {
-                "index": idx,
-                "status": "success",
-                "risk_level": risk_level,
-                "probability_default_percent": round(prob * 100, 2),
-                "binary_prediction": pred,
-                "input_features": imputed_data,
-                "imputation_log": imputation_log,
-            }
+    result["shap_explanation"] = shap_explanation
+    result["llm_explanation"] = llm_result.get("text") if isinstance(llm_result, dict) else str(llm_result)
+    result["remediation_suggestion"] = llm_result.get("remediation_suggestion") if isinstance(llm_result, dict) else None
+    return result
 
-            if include_explanations:
-                try:
-                    shap_values, _, df_features, _ = dynamic_predictor.get_shap_values(raw_input_dict)
-                    feature_names = df_features.columns.tolist()
-                    if isinstance(shap_values, list):
-                        shap_data = shap_values[1]
-                    else:
-                        shap_data = shap_values
 
-                    try:
-                        row = shap_data.tolist()[0]
-                    except Exception:
-                        row = np.asarray(shap_data).ravel().tolist()
+# Same options ORJSONResponse renders with, so numpy scalars/arrays serialize in streamed lines too
+NDJSON_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
-                    shap_explanation = {k: float(v) for k, v in zip(feature_names, row)}
 
-                    llm_result = await generate_llm_explanation(
-                        input_data=imputed_data,
-                        shap_explanation=shap_explanation,
-                        risk_level=risk_level,
-                    )
+def _ndjson_line(result: Dict[str, Any]) -> bytes:
+    return orjson.dumps(result, option=NDJSON_DUMPS_OPTIONS) + b"\n"
 
-                    result["shap_explanation"] = shap_explanation
-                    result["llm_explanation"] = llm_result.get("text") if isinstance(llm_result, dict) else str(llm_result)
-                    result["remediation_suggestion"] = (
-                        llm_result.get("remediation_suggestion") if isinstance(llm_result, dict) else None
-                    )
 
-                except Exception as e:
-                    logger.warning(f"Explanation generation failed for item {idx}: {e}")
-                    result["explanation_error"] = str(e)
+async def _stream_batch_results(results: List[Dict[str, Any]], explain_items: List[Tuple]):
+    """
+    NDJSON body for /predict_risk_batch?stream=true: rows with nothing left to do are written
+    immediately, then each explained row as soon as its LLM call completes.
+    """
+    pending = {id(item[0]) for item in explain_items}
+    for result in results:
+        if id(result) not in pending:
+            yield _ndjson_line(result)
 
-            results.append(result)
+    semaphore = asyncio.Semaphore(LLM_BATCH_CONCURRENCY)
+    tasks = [asyncio.create_task(_explain_batch_item(semaphore, item)) for item in explain_items]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield _ndjson_line(await finished)
+    finally:
+        # Client went away mid-stream: don't keep spending LLM calls on it
+        for task in tasks:
+            task.cancel()
 
-        except Exception as e:
-            logger.error(f"Batch item {idx} failed: {e}")
-            results.append({"index": idx, "status": "error", "error": str(e)})
 
-    return {"results": results, "count": len(results)}
+@router.post("/predict_risk_batch", response_class=ORJSONResponse)
+async def predict_risk_batch(
+    applications: List[DynamicLoanApplication], include_explanations: bool = False, stream: bool = False
+):
+    """
+    Batch prediction endpoint for CSV uploads.
 
+    Pass stream=true to receive application/x-ndjson instead: one result object per line,
+    written as each row completes (so not necessarily in input order; use "index").
+    """
+    dynamic_predictor = await _get_dynamic_predictor()
+    if dynamic_predictor is None:
+        raise HTTPException(status_code=503, detail={"status": "error", "message": "Dynamic predictor not loaded."})
 
-def _check_drift(data: Dict[str, Any]) -> List[str]:
-    warnings = []
+    raw_rows = [_application_fields(application) for application in applications]
+
+    # Imputation, prediction and SHAP are CPU-bound; run them off the event loop
+    results, explain_items = await to_thread.run_sync(
+        _predict_batch_rows, dynamic_predictor, raw_rows, include_explanations
+    )
+
+    if stream:
+        return StreamingResponse(_stream_batch_results(results, explain_items), media_type="application/x-ndjson")
+
+    if explain_items:
+        # The LLM calls are independent, so fan them out, capped to stay within provider limits
+        semaphore = asyncio.Semaphore(LLM_BATCH_CONCURRENCY)
+        await asyncio.gather(*(_explain_batch_item(semaphore, item) for item in explain_items))
+
+    return ORJSONResponse({"results": results, "count": len(results)})
+
+
+def _drift_value(data: Dict[str, Any], feat: str) -> float:
     try:
-        for feat, stats in FEATURE_STATS.items():
-            if feat in data:
-                try:
-                    val = float(data[feat])
-                except Exception:
-                    continue
-                mn = stats.get("min")
-                mx = stats.get("max")
-                mean = stats.get("mean")
-                std = stats.get("std")
-
-                if mn is not None and mx is not None and (val < mn or val > mx):
-                    warnings.append(f"{feat}: value {val} outside training min/max [{mn}, {mx}]")
-                elif mean is not None and std is not None and std >= 0:
-                    lower = mean - 3 * std
-                    upper = mean + 3 * std
-                    if val < lower or val > upper:
-                        warnings.append(f"{feat}: value {val} outside 3-sigma range [{lower:.2f}, {upper:.2f}]")
+        return float(data[feat])
+    except Exception:
+        return np.nan
+
+
+# (feature, value, lower, upper, kind) where kind is "range" (training min/max) or "sigma"
+DriftRecord = Tuple[str, float, Any, Any, str]
+
+
+def _check_drift(data: Dict[str, Any]) -> List[DriftRecord]:
+    """Return unformatted drift records; see _format_drift for the response strings."""
+    records = []
+    try:
+        # No stats loaded, or none of the monitored features were supplied
+        if not _DRIFT_FEATURES or _DRIFT_KEYS.isdisjoint(data):
+            return records
+
+        vals = np.fromiter(
+            (_drift_value(data, feat) if feat in data else np.nan for feat in _DRIFT_FEATURES),
+            dtype=np.float64,
+            count=len(_DRIFT_FEATURES),
+        )
+        out_of_range = _DRIFT_HAS_RANGE & ((vals < _DRIFT_MINS) | (vals > _DRIFT_MAXS))
+        # Min/max takes precedence; 3-sigma only reports features not already flagged
+        out_of_sigma = _DRIFT_SIGMA_OK & ~out_of_range & ((vals < _DRIFT_LOWER) | (vals > _DRIFT_UPPER))
+
+        for i in np.flatnonzero(out_of_range | out_of_sigma):
+            feat = _DRIFT_FEATURES[i]
+            if out_of_range[i]:
+                stats = FEATURE_STATS[feat]
+                records.append((feat, float(vals[i]), stats.get("min"), stats.get("max"), "range"))
+            else:
+                records.append((feat, float(vals[i]), float(_DRIFT_LOWER[i]), float(_DRIFT_UPPER[i]), "sigma"))
     except Exception as e:
         logger.debug(f"Error during drift check: {e}")
+    return records
+
+
+def _format_drift(records: List[DriftRecord]) -> List[str]:
+    """Render drift records as the warning strings returned to clients."""
+    warnings = []
+    for feat, val, lower, upper, kind in records:
+        if kind == "range":
+            warnings.append(f"{feat}: value {val} outside training min/max [{lower}, {upper}]")
+        else:
+            warnings.append(f"{feat}: value {val} outside 3-sigma range [{lower:.2f}, {upper:.2f}]")
     return warnings
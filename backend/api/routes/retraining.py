@@ -1,9 +1,7 @@
 import logging
-import os
-import shutil
-from pathlib import Path
 from typing import Any, Dict
 
+import pandas as pd
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
 
 from backend.services.database_retraining import check_retraining_status, retrain_from_database
@@ -68,7 +66,7 @@ def start_retraining(
 
 
 @router.post("/train/flexible")
-async def train_flexible_model(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+def train_flexible_model(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     Train a model from a CSV file with flexible column detection.
     """
@@ -76,25 +74,14 @@ async def train_flexible_model(background_tasks: BackgroundTasks, file: UploadFi
         raise HTTPException(status_code=400, detail="File must be a CSV")
 
     try:
-        # Save file temporarily
-        temp_dir = Path("temp_uploads")
-        temp_dir.mkdir(exist_ok=True)
-        temp_path = temp_dir / f"train_{file.filename}"
+        # Parse the upload straight from its spooled file (sync endpoint: parsing and training
+        # run in the threadpool) instead of copying it to disk and reading it back
+        df = pd.read_csv(file.file)
+        logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns from {file.filename}")
 
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Initialize trainer
+        # Training runs synchronously so the result can be returned, as the frontend expects
         trainer = FlexibleModelTrainer()
-
-        # Run training in background (or synchronously if fast enough, but better background)
-        # For now, we'll run it synchronously to return immediate results as the frontend expects
-        # If it's large, we should use background tasks, but the frontend seems to wait for result.
-
-        result = trainer.train_model(str(temp_path))
-
-        # Cleanup
-        os.remove(temp_path)
+        result = trainer.train_from_dataframe(df, source=file.filename)
 
         return {"status": "success", "result": result}
 
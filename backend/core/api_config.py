@@ -26,6 +26,11 @@ class GeminiConfig:
         self.enable_shap_explanations = os.getenv("ENABLE_SHAP_EXPLANATIONS", "true").lower() == "true"
         self.enable_chatbot = os.getenv("ENABLE_CHATBOT", "true").lower() == "true"
 
+        # Whether the two features use different keys; fixed once the keys are read
+        self.using_separate_keys = bool(
+            self.predictions_key and self.chatbot_key and self.predictions_key != self.chatbot_key
+        )
+
         # API URL
         self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
 
@@ -33,31 +38,9 @@ class GeminiConfig:
         self._log_config()
 
     def _log_config(self):
-        """Log the current configuration."""
-        logger.info("=" * 70)
-        logger.info("Gemini API Configuration")
-        logger.info("=" * 70)
-        logger.info(f"SHAP Explanations: {'✅ Enabled' if self.enable_shap_explanations else '❌ Disabled'}")
-        logger.info(f"Chatbot: {'✅ Enabled' if self.enable_chatbot else '❌ Disabled'}")
-
-        if self.predictions_key:
-            logger.info(f"Predictions API Key: Configured ({self.predictions_key[:10]}...)")
-        else:
-            logger.warning("Predictions API Key: Not configured")
-
-        if self.chatbot_key:
-            logger.info(f"Chatbot API Key: Configured ({self.chatbot_key[:10]}...)")
-        else:
-            logger.warning("Chatbot API Key: Not configured")
-
-        # Check if using same key
-        if self.predictions_key and self.chatbot_key:
-            if self.predictions_key == self.chatbot_key:
-                logger.info("ℹ️  Using same API key for both features")
-            else:
-                logger.info("✅ Using separate API keys for each feature")
-
-        logger.info("=" * 70)
+        """Log the current configuration as a single record."""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Gemini API configuration: %s", self.get_usage_stats())
 
     def get_predictions_key(self) -> str:
         """Get the API key for predictions/SHAP explanations."""
@@ -88,9 +71,7 @@ class GeminiConfig:
                 "has_key": bool(self.chatbot_key),
                 "operational": self.is_chatbot_enabled(),
             },
-            "using_separate_keys": (
-                self.predictions_key != self.chatbot_key if (self.predictions_key and self.chatbot_key) else False
-            ),
+            "using_separate_keys": self.using_separate_keys,
         }
 
 
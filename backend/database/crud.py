@@ -4,11 +4,11 @@ CRUD operations for database models.
 """
 
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
-from sqlalchemy import text, inspect
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import JSON, Integer, MetaData, Table, case, func, insert, inspect, select, text
 import re
 
 from backend.database import models
@@ -16,29 +16,110 @@ from backend.database import models
 logger = logging.getLogger(__name__)
 
 
+# ==================== Schema Cache ====================
+
+# Schema introspection results are cached per engine and dropped whenever this
+# module runs DDL. The TTL is a safety net for schema changes made elsewhere.
+SCHEMA_CACHE_TTL_SECONDS = 60.0
+SCHEMA_CACHE_MAX_ENTRIES = 128
+
+_schema_cache: Dict[Tuple[Any, str, str], Tuple[float, Any]] = {}
+
+
+def _cached_schema(bind, kind: str, table_name: str, load: Callable[[], Any]) -> Any:
+    """Return a cached introspection result, loading it on miss or expiry."""
+    key = (bind, kind, table_name)
+    now = time.monotonic()
+    entry = _schema_cache.get(key)
+    if entry is not None and now - entry[0] < SCHEMA_CACHE_TTL_SECONDS:
+        return entry[1]
+
+    value = load()
+    if len(_schema_cache) >= SCHEMA_CACHE_MAX_ENTRIES:
+        # Table names can come from request paths; keep the cache bounded
+        _schema_cache.clear()
+    _schema_cache[key] = (now, value)
+    return value
+
+
+def invalidate_schema_cache():
+    """Drop all cached schema information (and statistics) after a schema change."""
+    _schema_cache.clear()
+    invalidate_statistics_cache()
+
+
+def get_table_columns(db: Session, table_name: str) -> Optional[List[str]]:
+    """
+    Get the column names of a table, or None if the table does not exist.
+
+    Served from the schema cache, so repeated calls do not hit the database.
+    """
+    bind = db.get_bind()
+
+    def load() -> Optional[List[str]]:
+        inspector = inspect(bind)
+        if not inspector.has_table(table_name):
+            return None
+        return [c["name"] for c in inspector.get_columns(table_name)]
+
+    return _cached_schema(bind, "columns", table_name, load)
+
+
 # ==================== Loan Applications ====================
 
 
+def get_loan_application_table(db: Session) -> Table:
+    """
+    Get the reflected loan_applications table, including dynamic columns.
+
+    The reflection is served from the schema cache (see invalidate_schema_cache).
+    """
+    bind = db.get_bind()
+    return _cached_schema(
+        bind, "table", "loan_applications", lambda: Table("loan_applications", MetaData(), autoload_with=bind)
+    )
+
+
 def add_column_if_not_exists(db: Session, table_name: str, column_name: str, column_type: str = "FLOAT"):
     """Add a column to a table if it doesn't exist."""
-    # Sanitize column name to prevent SQL injection
-    if not re.match(r"^[a-zA-Z0-9_]+$", column_name):
-        raise ValueError(f"Invalid column name: {column_name}")
-
-    inspector = inspect(db.get_bind())
-    columns = [c["name"] for c in inspector.get_columns(table_name)]
-
-    if column_name not in columns:
-        try:
-            # Use text() for raw SQL
-            # Quote column name to handle reserved keywords
-            db.execute(text(f'ALTER TABLE {table_name} ADD COLUMN "{column_name}" {column_type}'))
-            db.commit()
-            logger.info(f"Added column {column_name} to {table_name}")
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Failed to add column {column_name}: {e}")
-            raise
+    add_columns_if_not_exist(db, table_name, {column_name: column_type})
+
+
+def add_columns_if_not_exist(db: Session, table_name: str, columns: Dict[str, str]):
+    """
+    Add the missing columns of {column_name: column_type} to a table in one DDL transaction.
+
+    PostgreSQL gets a single multi-clause ALTER TABLE (one lock and catalog update);
+    SQLite, which allows one ADD COLUMN per statement, runs them in a single transaction.
+    """
+    # Sanitize column names to prevent SQL injection
+    for column_name in columns:
+        if not re.match(r"^[a-zA-Z0-9_]+$", column_name):
+            raise ValueError(f"Invalid column name: {column_name}")
+
+    existing = set(get_table_columns(db, table_name) or ())
+    missing = {name: col_type for name, col_type in columns.items() if name not in existing}
+    if not missing:
+        return
+
+    # Quote column names to handle reserved keywords
+    clauses = [f'ADD COLUMN "{name}" {col_type}' for name, col_type in missing.items()]
+    if db.get_bind().dialect.name == "postgresql":
+        statements = [f"ALTER TABLE {table_name} " + ", ".join(clauses)]
+    else:
+        statements = [f"ALTER TABLE {table_name} {clause}" for clause in clauses]
+
+    try:
+        for statement in statements:
+            db.execute(text(statement))
+        db.commit()
+        logger.info(f"Added columns {', '.join(missing)} to {table_name}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to add columns {', '.join(missing)}: {e}")
+        raise
+    finally:
+        invalidate_schema_cache()
 
 
 def drop_loan_application_table(db: Session):
@@ -63,6 +144,8 @@ def drop_loan_application_table(db: Session):
     except Exception as e:
         logger.error(f"Error dropping loan_applications table: {e}")
         raise
+    finally:
+        invalidate_schema_cache()
 
 
 def create_loan_application_table(db: Session, csv_columns: Dict[str, Any]):
@@ -82,7 +165,7 @@ def create_loan_application_table(db: Session, csv_columns: Dict[str, Any]):
         Column("id", Integer, primary_key=True, index=True),
         Column("created_at", DateTime(timezone=True), server_default=func.now()),
         Column("updated_at", DateTime(timezone=True), onupdate=func.now()),
-        Column("application_status", String(50), default="pending"),
+        Column("application_status", String(50), default="pending", index=True),
         Column("notes", Text, nullable=True),
     ]
     
@@ -101,6 +184,7 @@ def create_loan_application_table(db: Session, csv_columns: Dict[str, Any]):
     # Create the table
     new_table = Table("loan_applications", metadata, *columns)
     new_table.create(bind=engine)
+    invalidate_schema_cache()
     logger.info(f"Created new loan_applications table with {len(columns)} columns")
     
     # Recreate dependent tables (Predictions)
@@ -109,40 +193,50 @@ def create_loan_application_table(db: Session, csv_columns: Dict[str, Any]):
     logger.info("Recreated dependent tables")
 
 
-def create_loan_application(db: Session, application_data: Dict[str, Any]) -> models.LoanApplication:
-    """Create a new loan application, handling dynamic columns."""
+def _ensure_dynamic_columns(db: Session, rows: List[Dict[str, Any]]) -> bool:
+    """
+    Add any keys of rows that are missing from loan_applications as columns.
+
+    Returns whether rows use keys outside the ORM model (dynamic columns), in which
+    case they must be inserted through the reflected Core table.
+    """
     # 1. Identify columns defined in the ORM model
     model_columns = {c.name for c in models.LoanApplication.__table__.columns}
     
     # 2. Identify keys in input data that are NOT in the ORM model
     # These are dynamic columns (either new or existing in DB but not in model)
-    dynamic_keys = [k for k in application_data.keys() if k not in model_columns]
+    dynamic_keys = {k for row in rows for k in row if k not in model_columns}
     
     # 3. Ensure dynamic columns exist in the database
     if dynamic_keys:
-        inspector = inspect(db.get_bind())
-        existing_db_columns = {c["name"] for c in inspector.get_columns("loan_applications")}
+        # Served from the schema cache, which add_columns_if_not_exist invalidates after DDL
+        existing_db_columns = set(get_table_columns(db, "loan_applications") or ())
         
-        for col in dynamic_keys:
-            if col not in existing_db_columns:
-                # Infer type
-                val = application_data[col]
-                col_type = "FLOAT"
-                if isinstance(val, str):
-                    col_type = "VARCHAR(255)"
-                
-                add_column_if_not_exists(db, "loan_applications", col, col_type)
-
-    # 4. Insert data
+        new_columns = {}
+        for col in sorted(dynamic_keys - existing_db_columns):
+            # Infer type from the first row that has a value for it
+            val = next((row[col] for row in rows if row.get(col) is not None), None)
+            new_columns[col] = "VARCHAR(255)" if isinstance(val, str) else "FLOAT"
+        
+        add_columns_if_not_exist(db, "loan_applications", new_columns)
+
+    return bool(dynamic_keys)
+
+
+def create_loan_application(db: Session, application_data: Dict[str, Any]) -> models.LoanApplication:
+    """
+    Create a new loan application, handling dynamic columns.
+
+    The returned object is expired by the commit and reloads on first attribute access.
+    """
     # If we have dynamic keys, we MUST use Core Insert because the ORM model class doesn't accept them
-    if dynamic_keys:
-        from sqlalchemy import MetaData, Table
-        metadata = MetaData()
-        table = Table('loan_applications', metadata, autoload_with=db.get_bind())
+    if _ensure_dynamic_columns(db, [application_data]):
+        table = get_loan_application_table(db)
         
         stmt = table.insert().values(**application_data)
         result = db.execute(stmt)
         db.commit()
+        invalidate_statistics_cache()
         
         # Return the created object (re-queried)
         # Note: This object will ONLY have the static model attributes populated.
@@ -152,13 +246,95 @@ def create_loan_application(db: Session, application_data: Dict[str, Any]) -> mo
         db_application = models.LoanApplication(**application_data)
         db.add(db_application)
         db.commit()
-        db.refresh(db_application)
+        invalidate_statistics_cache()
         return db_application
 
 
-def get_loan_application(db: Session, application_id: int) -> Optional[models.LoanApplication]:
-    """Get a loan application by ID."""
-    return db.query(models.LoanApplication).filter(models.LoanApplication.id == application_id).first()
+def bulk_create_loan_applications(db: Session, rows: List[Dict[str, Any]], commit: bool = True) -> List[int]:
+    """
+    Insert many loan applications (dynamic columns included) and return their IDs in row order.
+
+    Missing columns are added once for the whole batch, then the rows go through the cached
+    reflected table in one executemany INSERT ... RETURNING. All rows must share the same
+    keys. With commit=False, call invalidate_statistics_cache() after committing.
+    """
+    if not rows:
+        return []
+    _ensure_dynamic_columns(db, rows)
+    table = get_loan_application_table(db)
+    stmt = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+    ids = db.execute(stmt, rows).scalars().all()
+    if commit:
+        db.commit()
+        invalidate_statistics_cache()
+    return ids
+
+
+def supports_copy(db: Session) -> bool:
+    """Check whether the session's database supports COPY bulk loading (PostgreSQL via psycopg 3)."""
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg"
+
+
+def copy_loan_applications(db: Session, rows: List[Dict[str, Any]], table: Optional[Table] = None) -> List[int]:
+    """
+    Bulk load loan applications with PostgreSQL COPY FROM STDIN.
+
+    IDs are reserved from the table's sequence up front and copied in explicitly,
+    so callers get them back in row order without RETURNING. All rows must share
+    the same keys (as records built from one DataFrame chunk do). The COPY runs
+    on the session's connection, inside the current transaction; call
+    invalidate_statistics_cache() after committing it.
+    """
+    if table is None:
+        table = get_loan_application_table(db)
+
+    columns = list(rows[0].keys())
+    ids = (
+        db.execute(
+            text("SELECT nextval(pg_get_serial_sequence('loan_applications', 'id')) FROM generate_series(1, :n)"),
+            {"n": len(rows)},
+        )
+        .scalars()
+        .all()
+    )
+
+    # COPY parses text input strictly, so "5.0" is rejected by INTEGER columns where
+    # a parameterized INSERT would cast it; round those values like the INSERT would
+    integer_positions = [i for i, col in enumerate(columns) if isinstance(table.c[col].type, Integer)]
+
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    column_list = ", ".join(quote(col) for col in ["id", *columns])
+
+    cursor = db.connection().connection.cursor()
+    try:
+        with cursor.copy(f"COPY loan_applications ({column_list}) FROM STDIN") as copy:
+            for app_id, row in zip(ids, rows):
+                values = [app_id, *row.values()]
+                for i in integer_positions:
+                    val = values[i + 1]
+                    if isinstance(val, float):
+                        values[i + 1] = int(round(val))
+                copy.write_row(values)
+    finally:
+        cursor.close()
+
+    return ids
+
+
+def get_loan_application(
+    db: Session, application_id: int, with_predictions: bool = False
+) -> Optional[models.LoanApplication]:
+    """Get a loan application by ID, optionally with its predictions loaded in one extra query."""
+    if with_predictions:
+        # An instance already in the identity map would be returned as-is, without the option
+        return db.get(
+            models.LoanApplication,
+            application_id,
+            options=[selectinload(models.LoanApplication.predictions)],
+            populate_existing=True,
+        )
+    return db.get(models.LoanApplication, application_id)
 
 
 def get_loan_applications(
@@ -178,6 +354,7 @@ def update_loan_application(db: Session, application_id: int, update_data: Dict[
         for key, value in update_data.items():
             setattr(db_application, key, value)
         db.commit()
+        invalidate_statistics_cache()
         db.refresh(db_application)
     return db_application
 
@@ -185,25 +362,106 @@ def update_loan_application(db: Session, application_id: int, update_data: Dict[
 # ==================== Predictions ====================
 
 
+# Label fragment -> Prediction.risk_category, matching the labels CreditRiskPredictor emits
+RISK_CATEGORIES = (("High Risk", "high"), ("Borderline Risk", "borderline"), ("Low Risk", "low"))
+
+
+def risk_category(risk_level: Optional[str]) -> Optional[str]:
+    """Return the normalized risk_category for a risk_level label (None if it has none)."""
+    if risk_level:
+        for fragment, category in RISK_CATEGORIES:
+            if fragment in risk_level:
+                return category
+    return None
+
+
 def create_prediction(db: Session, prediction_data: Dict[str, Any]) -> models.Prediction:
-    """Create a new prediction record."""
-    db_prediction = models.Prediction(**prediction_data)
+    """
+    Create a new prediction record.
+
+    The returned object is expired by the commit and reloads on first attribute access;
+    there is no eager refresh, so callers that ignore it cost no extra SELECT.
+    """
+    db_prediction = models.Prediction(
+        **{"risk_category": risk_category(prediction_data.get("risk_level")), **prediction_data}
+    )
     db.add(db_prediction)
     db.commit()
-    db.refresh(db_prediction)
+    invalidate_statistics_cache()
     return db_prediction
 
 
+def bulk_create_predictions(db: Session, rows: List[Dict[str, Any]], commit: bool = True) -> List[int]:
+    """
+    Insert many prediction records with one executemany call and return their IDs in row order.
+
+    The engine's insertmanyvalues_page_size batches the rows into multi-row INSERT ... RETURNING
+    statements, so this costs a round trip per page instead of an INSERT, commit and refresh
+    per row. Pass commit=False to keep the rows in the caller's transaction, and call
+    invalidate_statistics_cache() after committing it.
+    """
+    if not rows:
+        return []
+    rows = [{"risk_category": risk_category(row.get("risk_level")), **row} for row in rows]
+    stmt = insert(models.Prediction).returning(models.Prediction.id, sort_by_parameter_order=True)
+    ids = db.execute(stmt, rows).scalars().all()
+    if commit:
+        db.commit()
+        invalidate_statistics_cache()
+    return ids
+
+
+def copy_predictions(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Bulk load prediction records with PostgreSQL COPY FROM STDIN (see supports_copy).
+
+    For large batches whose IDs the caller does not need, such as historical imports. All rows
+    must share the same keys. The COPY runs inside the session's current transaction; call
+    invalidate_statistics_cache() after committing it.
+    """
+    if not rows:
+        return
+    from psycopg.types.json import Jsonb
+
+    table = models.Prediction.__table__
+    columns = ["risk_category", *(col for col in rows[0] if col != "risk_category")]
+    # COPY has no JSON adaptation of its own, so dicts/lists headed for JSON columns are wrapped
+    json_positions = [i for i, col in enumerate(columns) if isinstance(table.c[col].type, JSON)]
+
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    column_list = ", ".join(quote(col) for col in columns)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        with cursor.copy(f"COPY predictions ({column_list}) FROM STDIN") as copy:
+            for row in rows:
+                values = [risk_category(row.get("risk_level")), *(row[col] for col in columns[1:])]
+                for i in json_positions:
+                    if values[i] is not None:
+                        values[i] = Jsonb(values[i])
+                copy.write_row(values)
+    finally:
+        cursor.close()
+
+
 def get_prediction(db: Session, prediction_id: int) -> Optional[models.Prediction]:
     """Get a prediction by ID."""
-    return db.query(models.Prediction).filter(models.Prediction.id == prediction_id).first()
+    # Session.get checks the identity map before querying and runs a cached primary-key load
+    return db.get(models.Prediction, prediction_id)
 
 
 def get_predictions(
-    db: Session, skip: int = 0, limit: int = 100, model_type: Optional[str] = None, application_id: Optional[int] = None
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    model_type: Optional[str] = None,
+    application_id: Optional[int] = None,
+    with_application: bool = False,
 ) -> List[models.Prediction]:
-    """Get list of predictions."""
+    """Get list of predictions; with_application loads their applications with one IN query."""
     query = db.query(models.Prediction)
+    if with_application:
+        query = query.options(selectinload(models.Prediction.loan_application))
     if model_type:
         query = query.filter(models.Prediction.model_type == model_type)
     if application_id:
@@ -211,14 +469,39 @@ def get_predictions(
     return query.order_by(models.Prediction.created_at.desc()).offset(skip).limit(limit).all()
 
 
+def iter_predictions(
+    db: Session,
+    model_type: Optional[str] = None,
+    with_feedback: bool = False,
+    limit: Optional[int] = None,
+    batch_size: int = 1000,
+) -> Iterator[models.Prediction]:
+    """
+    Iterate over predictions, newest first, fetching batch_size rows at a time.
+
+    Unlike get_predictions, the result is streamed (yield_per) rather than materialized,
+    so memory stays bounded by the batch size however many rows match.
+    """
+    stmt = select(models.Prediction)
+    if model_type:
+        stmt = stmt.where(models.Prediction.model_type == model_type)
+    if with_feedback:
+        stmt = stmt.where(models.Prediction.actual_outcome.isnot(None))
+    stmt = stmt.order_by(models.Prediction.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return iter(db.scalars(stmt.execution_options(yield_per=batch_size)))
+
+
 def update_prediction_feedback(db: Session, prediction_id: int, actual_outcome: int) -> Optional[models.Prediction]:
     """Update prediction with actual outcome for model improvement."""
     db_prediction = get_prediction(db, prediction_id)
     if db_prediction:
         db_prediction.actual_outcome = actual_outcome
-        db_prediction.feedback_date = datetime.utcnow()
+        # Stamped by the database clock in the UPDATE itself; reloads on next access
+        db_prediction.feedback_date = func.now()
         db.commit()
-        db.refresh(db_prediction)
+        invalidate_statistics_cache()
     return db_prediction
 
 
@@ -230,11 +513,10 @@ def update_prediction_feedback(db: Session, prediction_id: int, actual_outcome:
 
 
 def create_model_metrics(db: Session, metrics_data: Dict[str, Any]) -> models.ModelMetrics:
-    """Create model metrics record."""
+    """Create model metrics record (reloaded lazily, like create_prediction)."""
     db_metrics = models.ModelMetrics(**metrics_data)
     db.add(db_metrics)
     db.commit()
-    db.refresh(db_metrics)
     return db_metrics
 
 
@@ -258,12 +540,64 @@ def get_latest_model_metrics(db: Session, model_type: str) -> Optional[models.Mo
 
 # ==================== Statistics ====================
 
+# Statistics are cached per engine. Writes made through this module drop the cache once they
+# are committed; the TTL bounds how stale counts can get from writes made by other processes.
+STATISTICS_CACHE_TTL_SECONDS = 60.0
+
+_statistics_cache: Dict[Tuple[Any, str], Tuple[float, Dict[str, Any]]] = {}
+# Bumped on every invalidation, so a load that overlapped a commit is not cached
+_statistics_generation = 0
+
+
+def invalidate_statistics_cache():
+    """Drop cached statistics after committed changes to predictions or applications."""
+    global _statistics_generation
+    _statistics_generation += 1
+    _statistics_cache.clear()
+
+
+def _cached_statistics(db: Session, name: str, load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    key = (db.get_bind(), name)
+    now = time.monotonic()
+    entry = _statistics_cache.get(key)
+    if entry is None or now - entry[0] >= STATISTICS_CACHE_TTL_SECONDS:
+        generation = _statistics_generation
+        entry = (now, load())
+        if generation == _statistics_generation:
+            _statistics_cache[key] = entry
+    # Callers get their own copy so they cannot modify the cached dict
+    return dict(entry[1])
+
+
+def _count_where(condition):
+    # COUNT ignores NULLs, so this counts only the rows matching condition (portable FILTER)
+    return func.count(case((condition, 1)))
+
+
+def _count_risk_category(category: str):
+    return (
+        select(func.count())
+        .select_from(models.Prediction)
+        .where(models.Prediction.risk_category == category)
+        .scalar_subquery()
+    )
+
 
 def get_prediction_statistics(db: Session) -> Dict[str, Any]:
-    """Get overall prediction statistics."""
-    total = db.query(models.Prediction).count()
-    high_risk = db.query(models.Prediction).filter(models.Prediction.risk_level.like("%High Risk%")).count()
-    low_risk = db.query(models.Prediction).filter(models.Prediction.risk_level.like("%Low Risk%")).count()
+    """Get overall prediction statistics (cached, see STATISTICS_CACHE_TTL_SECONDS)."""
+    return _cached_statistics(db, "predictions", lambda: _load_prediction_statistics(db))
+
+
+def _load_prediction_statistics(db: Session) -> Dict[str, Any]:
+    # One round trip; the per-category counts are scalar subqueries that can be answered
+    # from ix_predictions_risk_category rather than by matching every row's label
+    total, high_risk, low_risk = db.execute(
+        select(
+            select(func.count()).select_from(models.Prediction).scalar_subquery(),
+            _count_risk_category("high"),
+            _count_risk_category("low"),
+        )
+    ).one()
 
     return {
         "total_predictions": total,
@@ -273,11 +607,31 @@ def get_prediction_statistics(db: Session) -> Dict[str, Any]:
     }
 
 
+def get_feedback_counts(db: Session) -> Tuple[int, int]:
+    """Return (total predictions, predictions with actual_outcome feedback) from one query."""
+    return tuple(
+        db.execute(
+            select(func.count(), _count_where(models.Prediction.actual_outcome.isnot(None))).select_from(
+                models.Prediction
+            )
+        ).one()
+    )
+
+
 def get_application_statistics(db: Session) -> Dict[str, Any]:
-    """Get loan application statistics."""
-    total = db.query(models.LoanApplication).count()
-    pending = db.query(models.LoanApplication).filter(models.LoanApplication.application_status == "pending").count()
-    approved = db.query(models.LoanApplication).filter(models.LoanApplication.application_status == "approved").count()
-    rejected = db.query(models.LoanApplication).filter(models.LoanApplication.application_status == "rejected").count()
+    """Get loan application statistics (cached, see STATISTICS_CACHE_TTL_SECONDS)."""
+    return _cached_statistics(db, "applications", lambda: _load_application_statistics(db))
+
+
+def _load_application_statistics(db: Session) -> Dict[str, Any]:
+    status = models.LoanApplication.application_status
+    total, pending, approved, rejected = db.execute(
+        select(
+            func.count(),
+            _count_where(status == "pending"),
+            _count_where(status == "approved"),
+            _count_where(status == "rejected"),
+        ).select_from(models.LoanApplication)
+    ).one()
 
     return {"total_applications": total, "pending": pending, "approved": approved, "rejected": rejected}
@@ -3,11 +3,16 @@
 Database models for credit risk application.
 """
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from backend.database.config import Base
 
+# Binary JSONB on PostgreSQL (no reparse of the stored text on every read), plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 class LoanApplication(Base):
     """Model for storing loan applications."""
@@ -38,25 +43,51 @@ class LoanApplication(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Additional fields
-    application_status = Column(String(50), default="pending")  # pending, approved, rejected
+    application_status = Column(String(50), default="pending", index=True)  # pending, approved, rejected
     notes = Column(Text, nullable=True)
 
+    # Relationships below are joined on Prediction.application_id (no FK constraint, since the
+    # importer recreates this table) and refuse lazy loading: load them with selectinload
+    # (see crud) so listing rows never issues one SELECT per row
+    predictions = relationship(
+        "Prediction",
+        primaryjoin="LoanApplication.id == foreign(Prediction.application_id)",
+        viewonly=True,
+        lazy="raise",
+    )
+
 
 class Prediction(Base):
     """Model for storing prediction results."""
 
     __tablename__ = "predictions"
+    # get_predictions filters on application_id or model_type and orders by newest first;
+    # a B-tree is walked backwards for DESC, so these serve ORDER BY ... LIMIT without a sort
+    __table_args__ = (
+        Index("ix_predictions_application_id_created_at", "application_id", "created_at"),
+        Index("ix_predictions_model_type_created_at", "model_type", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     # Link to application (optional)
     application_id = Column(Integer, nullable=True)
 
+    loan_application = relationship(
+        "LoanApplication",
+        primaryjoin="foreign(Prediction.application_id) == LoanApplication.id",
+        viewonly=True,
+        lazy="raise",
+    )
+
     # Input features (stored as JSON)
-    input_features = Column(JSON)
+    input_features = Column(JSONType)
 
     # Prediction results
     risk_level = Column(String(50))
+    # Normalized bucket of risk_level (high, borderline, low; NULL for imported history) so
+    # statistics can count on an indexed equality instead of LIKE '%...%' over the labels
+    risk_category = Column(String(10), index=True)
     probability_default = Column(Float)
     binary_prediction = Column(Integer)
 
@@ -65,14 +96,14 @@ class Prediction(Base):
     model_version = Column(String(50), nullable=True)
 
     # Additional results
-    shap_values = Column(JSON, nullable=True)
+    shap_values = Column(JSONType, nullable=True)
     explanation = Column(Text, nullable=True)
-    key_factors = Column(JSON, nullable=True)
+    key_factors = Column(JSONType, nullable=True)
     remediation_suggestion = Column(Text, nullable=True)
     confidence = Column(Float, nullable=True)
 
     # Metadata
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     prediction_time_ms = Column(Float, nullable=True)
 
     # Feedback (for model improvement)
@@ -88,6 +119,7 @@ class ModelMetrics(Base):
     """Model for storing model performance metrics."""
 
     __tablename__ = "model_metrics"
+    __table_args__ = (Index("ix_model_metrics_model_type_evaluation_date", "model_type", "evaluation_date"),)
 
     id = Column(Integer, primary_key=True, index=True)
 
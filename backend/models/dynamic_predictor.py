@@ -6,7 +6,9 @@ Wraps the original CreditRiskPredictor with flexible input processing.
 
 import logging
 import os
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from backend.models.predictor import CreditRiskPredictor
 from backend.services.imputation import DynamicFeatureMapper, FeatureImputer
@@ -20,6 +22,12 @@ class DynamicCreditRiskPredictor:
     Automatically imputes missing values and adapts to different input formats.
     """
     
+    # validate_input rules, built once rather than per request
+    _CRITICAL_FIELDS = ('person_income', 'loan_amnt')
+    _NON_NEGATIVE_FIELDS = ('person_income', 'person_emp_length', 'loan_amnt',
+                            'loan_int_rate', 'cb_person_cred_hist_length')
+    _AGE_RANGE = (18, 100)
+    
     def __init__(self, 
                  stats_path: Optional[str] = None,
                  historical_data_path: Optional[str] = None):
@@ -52,7 +60,8 @@ class DynamicCreditRiskPredictor:
     def predict(self, 
                 input_data: Dict[str, Any], 
                 flag_threshold: float = 0.6,
-                return_imputation_log: bool = False) -> Tuple:
+                return_imputation_log: bool = False,
+                return_prepared: bool = False) -> Tuple:
         """
         Make a prediction with dynamic input handling.
         
@@ -60,26 +69,51 @@ class DynamicCreditRiskPredictor:
             input_data: Dictionary with partial or complete loan application data
             flag_threshold: Threshold for high risk classification
             return_imputation_log: Whether to return imputation details
+            return_prepared: Whether to also return the scaled feature matrix, which can be
+                passed to get_shap_values_from_prepared without imputing/scaling again
             
         Returns:
-            Tuple of (risk_level, probability, binary_prediction, [imputation_log])
+            Tuple of (risk_level, probability, binary_prediction, [imputation_log, imputed_data],
+            [scaled_features])
         """
-        # Step 1: Impute missing values
-        imputed_data, imputation_log = self.imputer.impute(input_data)
+        row, imputed_data, imputation_log = self.prepare_row(input_data)
+        scaled_features = self.predictor.preprocess_array(row)
         
-        # Step 2: Map to model features (one-hot encoding)
-        mapped_features = self.mapper.map_to_model_features(imputed_data)
+        # Make prediction using the core predictor
+        result = self.predictor.predict_prepared(scaled_features, flag_threshold)[0]
         
-        # Step 3: Ensure all expected features are present
-        complete_features = self.mapper.validate_and_fill(mapped_features)
+        if return_imputation_log:
+            result += (imputation_log, imputed_data)
+        if return_prepared:
+            result += (scaled_features,)
+        return result
+    
+    def prepare_row(self, input_data: Dict[str, Any]) -> Tuple[np.ndarray, Dict[str, Any], list]:
+        """
+        Impute raw input and map it straight to a raw model feature row (feature_names order).
         
-        # Step 4: Make prediction using the core predictor
-        risk_level, prob, pred = self.predictor.predict(complete_features, flag_threshold)
+        Returns:
+            Tuple of (row, imputed_data, imputation_log)
+        """
+        imputed_data, imputation_log = self.imputer.impute(input_data)
+        return self.mapper.to_feature_row(imputed_data), imputed_data, imputation_log
+    
+    def preprocess_array(self, rows: np.ndarray):
+        """Scale raw feature rows (see prepare_row) into one model input matrix."""
+        return self.predictor.preprocess_array(rows)
+    
+    def predict_prepared(self, scaled_features, flag_threshold: float = 0.6) -> List[Tuple]:
+        """Predict from a scaled feature matrix (see preprocess_array / predict(return_prepared=True))."""
+        return self.predictor.predict_prepared(scaled_features, flag_threshold)
+    
+    def get_shap_values_from_prepared(self, scaled_features):
+        """
+        Get SHAP values from a scaled feature matrix without re-running imputation or scaling.
         
-        if return_imputation_log:
-            return risk_level, prob, pred, imputation_log, imputed_data
-        else:
-            return risk_level, prob, pred
+        Returns:
+            Tuple of (shap_values, expected_value); columns follow self.predictor.feature_names
+        """
+        return self.predictor.get_shap_values_from_prepared(scaled_features)
     
     def get_shap_values(self, input_data: Dict[str, Any]):
         """
@@ -89,17 +123,15 @@ class DynamicCreditRiskPredictor:
             input_data: Dictionary with partial or complete loan application data
             
         Returns:
-            Tuple of (shap_values, expected_value, features_df, imputed_data)
+            Tuple of (shap_values, expected_value, feature_names, imputed_data)
         """
         # Impute and map features
-        imputed_data, _ = self.imputer.impute(input_data)
-        mapped_features = self.mapper.map_to_model_features(imputed_data)
-        complete_features = self.mapper.validate_and_fill(mapped_features)
+        row, imputed_data, _ = self.prepare_row(input_data)
         
         # Get SHAP values
-        shap_values, expected_value, df_features = self.predictor.get_shap_values(complete_features)
+        shap_values, expected_value = self.get_shap_values_from_prepared(self.predictor.preprocess_array(row))
         
-        return shap_values, expected_value, df_features, imputed_data
+        return shap_values, expected_value, self.predictor.feature_names, imputed_data
     
     def get_feature_importance(self, input_data: Dict[str, Any]) -> Dict[str, float]:
         """
@@ -111,7 +143,7 @@ class DynamicCreditRiskPredictor:
         Returns:
             Dictionary mapping feature names to importance scores
         """
-        shap_values, _, df_features, _ = self.get_shap_values(input_data)
+        shap_values, _, feature_names, _ = self.get_shap_values(input_data)
         
         # Handle binary classification SHAP values
         if isinstance(shap_values, list):
@@ -119,15 +151,13 @@ class DynamicCreditRiskPredictor:
         else:
             shap_data = shap_values
         
-        # Extract feature importance
-        try:
-            row = shap_data.tolist()[0]
-        except Exception:
-            import numpy as np
-            row = np.asarray(shap_data).ravel().tolist()
+        # Extract feature importance (first row of a 2D explanation)
+        arr = np.asarray(shap_data, dtype=np.float64)
+        row = arr[0] if arr.ndim == 2 else arr.ravel()
+        if len(row) != len(feature_names):
+            raise ValueError(f"Got {len(row)} SHAP values for {len(feature_names)} features")
         
-        feature_names = df_features.columns.tolist()
-        importance = {k: float(v) for k, v in zip(feature_names, row)}
+        importance = dict(zip(feature_names, row.tolist()))
         
         return importance
     
@@ -148,28 +178,33 @@ class DynamicCreditRiskPredictor:
             warnings.append("No input data provided - all values will be imputed")
             return False, warnings
         
-        # Check for critical missing fields
-        critical_fields = ['person_income', 'loan_amnt']
-        missing_critical = [f for f in critical_fields if input_data.get(f) is None]
+        get = input_data.get
         
+        # Check for critical missing fields
+        missing_critical = [f for f in self._CRITICAL_FIELDS if get(f) is None]
         if missing_critical:
             warnings.append(f"Critical fields missing (will be imputed): {', '.join(missing_critical)}")
         
+        # Only range/sign problems make the input invalid; missing fields are imputed
+        is_valid = True
+        
         # Check for invalid ranges
-        if input_data.get('person_age') is not None:
-            if input_data['person_age'] < 18 or input_data['person_age'] > 100:
-                warnings.append(f"person_age ({input_data['person_age']}) outside valid range [18, 100]")
+        age = get('person_age')
+        min_age, max_age = self._AGE_RANGE
+        if age is not None and not min_age <= age <= max_age:
+            warnings.append(f"person_age ({age}) outside valid range [{min_age}, {max_age}]")
+            is_valid = False
         
-        if input_data.get('loan_percent_income') is not None:
-            if input_data['loan_percent_income'] > 1:
-                warnings.append(f"loan_percent_income ({input_data['loan_percent_income']}) > 1 (should be 0-1)")
+        loan_percent_income = get('loan_percent_income')
+        if loan_percent_income is not None and loan_percent_income > 1:
+            warnings.append(f"loan_percent_income ({loan_percent_income}) > 1 (should be 0-1)")
+            is_valid = False
         
         # Check for negative values
-        numeric_fields = ['person_income', 'person_emp_length', 'loan_amnt', 
-                         'loan_int_rate', 'cb_person_cred_hist_length']
-        for field in numeric_fields:
-            if input_data.get(field) is not None and input_data[field] < 0:
-                warnings.append(f"{field} is negative: {input_data[field]}")
+        for field in self._NON_NEGATIVE_FIELDS:
+            value = get(field)
+            if value is not None and value < 0:
+                warnings.append(f"{field} is negative: {value}")
+                is_valid = False
         
-        is_valid = len(warnings) == 0 or all('will be imputed' in w for w in warnings)
         return is_valid, warnings
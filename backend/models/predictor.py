@@ -1,24 +1,63 @@
 import json
 import logging
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import joblib
 import numpy as np
 import pandas as pd
+from sklearn.preprocessing import StandardScaler
 
 from backend.core.config import FEATURE_NAMES_PKL, MODEL_PKL, SCALER_PKL
 
 logger = logging.getLogger(__name__)
 
+# Deserialized joblib artifacts keyed by path and file stamp. The primary and dynamic
+# predictors load the same model and scaler, and reloads often find the files unchanged;
+# a replaced file has a new stamp, so it is read again. Bounded so retraining, which
+# writes new versioned files, does not keep old models alive.
+ARTIFACT_CACHE_MAX_ENTRIES = 4
+_artifact_cache: Dict[str, Tuple[Tuple[int, int], object]] = {}
+
+
+def _load_joblib_artifact(path: str):
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    entry = _artifact_cache.get(path)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    artifact = joblib.load(path)
+    _artifact_cache.pop(path, None)
+    while len(_artifact_cache) >= ARTIFACT_CACHE_MAX_ENTRIES:
+        # Evict the least recently loaded entry (dicts keep insertion order)
+        del _artifact_cache[next(iter(_artifact_cache))]
+    _artifact_cache[path] = (stamp, artifact)
+    return artifact
+
+
 class CreditRiskPredictor:
     def __init__(self):
         self.model = None
         self.scaler = None
         self.feature_names = None
         self.load_error = None
+        # Column position of each feature name (see _init_feature_index)
+        self._feature_index = {}
+        # SHAP explainer is created on first explanation request (see _get_explainer)
+        self._explainer = None
+        # StandardScaler parameters for scaling ndarray rows directly (see _init_scaling)
+        self._scale_offset = None
+        self._scale_factor = None
+        # XGBoost booster for direct probability prediction (see _init_booster)
+        self._booster = None
+        self._iteration_range = (0, 0)
         self._load_model()
+        self._init_feature_index()
+        self._init_scaling()
+        self._init_booster()
 
     def _load_model(self) -> None:
         """Load the model and supporting files."""
@@ -51,7 +90,7 @@ class CreditRiskPredictor:
                                 model_path = os.path.normpath(model_path)
                             if os.path.exists(model_path):
                                 logger.info(f"Loading model from: {model_path}")
-                                self.model = joblib.load(model_path)
+                                self.model = _load_joblib_artifact(model_path)
                             else:
                                 logger.warning(f"Model path from manifest does not exist: {model_path}")
                         if scaler_path:
@@ -61,7 +100,7 @@ class CreditRiskPredictor:
                                 scaler_path = os.path.normpath(scaler_path)
                             if os.path.exists(scaler_path):
                                 logger.info(f"Loading scaler from: {scaler_path}")
-                                self.scaler = joblib.load(scaler_path)
+                                self.scaler = _load_joblib_artifact(scaler_path)
                             else:
                                 logger.warning(f"Scaler path from manifest does not exist: {scaler_path}")
                         if features_path:
@@ -85,13 +124,13 @@ class CreditRiskPredictor:
                 logger.info(f"Loading model from fallback path: {model_path}")
                 if not model_path.exists():
                     raise FileNotFoundError(f"Model file not found at: {model_path}")
-                self.model = joblib.load(str(model_path))
+                self.model = _load_joblib_artifact(str(model_path))
             if self.scaler is None:
                 scaler_path = Path(SCALER_PKL)
                 logger.info(f"Loading scaler from fallback path: {scaler_path}")
                 if not scaler_path.exists():
                     raise FileNotFoundError(f"Scaler file not found at: {scaler_path}")
-                self.scaler = joblib.load(str(scaler_path))
+                self.scaler = _load_joblib_artifact(str(scaler_path))
             if self.feature_names is None:
                 features_path = Path(FEATURE_NAMES_PKL)
                 logger.info(f"Loading feature names from fallback path: {features_path}")
@@ -122,6 +161,49 @@ class CreditRiskPredictor:
             # Re-raise so callers (API/app) can decide how to handle load failures
             raise e
 
+    def _init_feature_index(self) -> None:
+        """
+        Intern the loaded feature names (JSON-loaded strings are not, unlike the literal keys
+        callers build dicts with) and map each to its column, for filling sparse input rows.
+        """
+        self.feature_names = [sys.intern(str(name)) for name in self.feature_names]
+        self._feature_index = {name: i for i, name in enumerate(self.feature_names)}
+
+    def _init_scaling(self) -> None:
+        """
+        Cache StandardScaler's (X - mean_) / scale_ parameters. The scaler was fitted on a
+        DataFrame, so sklearn would warn on every ndarray passed to transform().
+        """
+        if not isinstance(self.scaler, StandardScaler):
+            return
+        n_features = len(self.feature_names)
+        self._scale_offset = self.scaler.mean_ if self.scaler.with_mean else np.zeros(n_features)
+        self._scale_factor = self.scaler.scale_ if self.scaler.with_std else np.ones(n_features)
+
+    def _init_booster(self) -> None:
+        """
+        Keep the Booster of a binary XGBClassifier, whose inplace_predict returns P(default)
+        directly instead of rebuilding a DMatrix in both predict() and predict_proba().
+        """
+        if getattr(self.model, "objective", None) != "binary:logistic" or not hasattr(self.model, "get_booster"):
+            return
+        self._booster = self.model.get_booster()
+        # Match the sklearn wrapper, which stops at the best iteration of early-stopped models
+        try:
+            self._iteration_range = (0, self.model.best_iteration + 1)
+        except AttributeError:
+            self._iteration_range = (0, 0)
+
+    def preprocess_array(self, features: np.ndarray) -> np.ndarray:
+        """
+        Scale raw feature rows given as an ndarray (columns in self.feature_names order),
+        without building per-row dicts or a DataFrame.
+        """
+        X = np.asarray(features, dtype=np.float64).reshape(-1, len(self.feature_names))
+        if self._scale_offset is not None:
+            return (X - self._scale_offset) / self._scale_factor
+        return self.scaler.transform(pd.DataFrame(X, columns=self.feature_names))
+
     def preprocess_features(self, input_dict: Dict[str, Union[float, str]]) -> pd.DataFrame:
         """
         Preprocess the input features for prediction.
@@ -132,13 +214,41 @@ class CreditRiskPredictor:
         Returns:
             Preprocessed features as a DataFrame
         """
-        # Build full feature dict with one-hot encoded categorical variables
-        input_full = {col: input_dict.get(col, 0) for col in self.feature_names}
-        df_input = pd.DataFrame([input_full])
-        
-        # Scale numeric features
-        scaled = self.scaler.transform(df_input)
-        return scaled
+        return self.preprocess_batch([input_dict])
+
+    def preprocess_batch(self, input_dicts: List[Dict[str, Union[float, str]]]):
+        """
+        Preprocess several inputs into a single scaled feature matrix (one row per input).
+        Features missing from an input are 0 (one-hot columns not set); None becomes NaN.
+        """
+        # Fill the raw matrix straight from the dicts; a DataFrame here cost far more than
+        # the scaling itself. A fresh array per call keeps this safe across request threads.
+        names = self.feature_names
+        n_features = len(names)
+        index = self._feature_index
+        rows = []
+        for input_dict in input_dicts:
+            if len(input_dict) >= n_features:
+                # Complete feature dicts: one pass in column order
+                rows.append([input_dict.get(col, 0) for col in names])
+                continue
+            # Sparse dicts: set only the keys present; everything else stays 0
+            row = [0] * n_features
+            for key, value in input_dict.items():
+                col = index.get(key)
+                if col is not None:
+                    row[col] = value
+            rows.append(row)
+        return self.preprocess_array(np.array(rows, dtype=np.float64))
+
+    @staticmethod
+    def _risk_levels(probs: np.ndarray, flag_threshold: float) -> List[str]:
+        """Map probabilities of default to risk labels for a whole batch at once."""
+        return np.select(
+            [probs > flag_threshold, probs > 0.4],
+            ["High Risk 🔴", "Borderline Risk 🟠"],
+            default="Low Risk 🟢",
+        ).tolist()
 
     def predict(self, input_dict: Dict[str, Union[float, str]], flag_threshold: float = 0.6) -> Tuple[str, float, int]:
         """
@@ -151,47 +261,82 @@ class CreditRiskPredictor:
         Returns:
             Tuple containing (risk_level, probability, binary_prediction)
         """
-        # Preprocess features
-        scaled_features = self.preprocess_features(input_dict)
+        return self.predict_batch([input_dict], flag_threshold)[0]
+
+    def predict_batch(
+        self, input_dicts: List[Dict[str, Union[float, str]]], flag_threshold: float = 0.6
+    ) -> List[Tuple[str, float, int]]:
+        """
+        Predict several inputs with one model call.
+        
+        Args:
+            input_dicts: Dictionaries containing the input features
+            flag_threshold: Threshold for high risk classification
+            
+        Returns:
+            List of (risk_level, probability, binary_prediction) tuples, in input order
+        """
+        return self.predict_prepared(self.preprocess_batch(input_dicts), flag_threshold)
+
+    def predict_prepared(self, scaled_features, flag_threshold: float = 0.6) -> List[Tuple[str, float, int]]:
+        """
+        Predict from an already preprocessed feature matrix (see preprocess_batch), so callers
+        that also need SHAP values can scale the inputs once.
+        
+        Returns:
+            List of (risk_level, probability, binary_prediction) tuples, one per matrix row
+        """
+        if self._booster is not None:
+            probs = np.asarray(
+                self._booster.inplace_predict(scaled_features, iteration_range=self._iteration_range),
+                dtype=np.float64,
+            ).reshape(-1)
+            # XGBClassifier.predict thresholds binary probabilities at 0.5
+            preds = (probs > 0.5).astype(np.int64)
+        else:
+            probs, preds = self._predict_with_estimator(scaled_features)
         
+        risk_levels = self._risk_levels(probs, flag_threshold)
+
+        # .tolist() yields native Python floats/ints for JSON friendliness
+        return [
+            (risk_level, prob, int(pred))
+            for risk_level, prob, pred in zip(risk_levels, probs.tolist(), preds.tolist())
+        ]
+
+    def _predict_with_estimator(self, scaled_features) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (probabilities of default, binary predictions) through the estimator's own API."""
         # Make prediction
-        pred = self.model.predict(scaled_features)[0]
+        preds = np.asarray(self.model.predict(scaled_features)).reshape(-1)
         
         # Get probability of default (Class 1)
         try:
-            # Get the raw probability array for the first sample
-            raw_proba = self.model.predict_proba(scaled_features)[0] 
+            raw_proba = np.asarray(self.model.predict_proba(scaled_features))
             
             # Check the size of the probability output
-            if len(raw_proba) == 2:
+            if raw_proba.ndim == 2 and raw_proba.shape[1] == 2:
                 # Standard binary output: [P(Class 0), P(Class 1)]
-                prob = raw_proba[1]
-            elif len(raw_proba) == 1:
+                probs = raw_proba[:, 1]
+            elif raw_proba.ndim == 2 and raw_proba.shape[1] == 1:
                 # Single column output: [P(Class 1)]
-                prob = raw_proba[0]
+                probs = raw_proba[:, 0]
             else:
                 # Fallback if prediction fails or is unexpected
-                prob = float(pred)  # use raw prediction as probability-like value
-            # Ensure native Python float for JSON friendliness
-            prob = float(prob)
-                
+                probs = preds  # use raw prediction as probability-like value
         except Exception as e:
             # fallback if predict_proba itself throws an error
             logger.warning("predict_proba failed; falling back to raw prediction. Error: %s", e)
-            prob = float(pred)
-        
-        # Determine risk level
-        if prob > flag_threshold:
-            risk_level = "High Risk 🔴"
-            risk_class = "risk-high"
-        elif prob > 0.4:
-            risk_level = "Borderline Risk 🟠"
-            risk_class = "risk-borderline"
-        else:
-            risk_level = "Low Risk 🟢"
-            risk_class = "risk-low"
+            probs = preds
         
-        return risk_level, prob, int(pred)
+        return np.asarray(probs, dtype=np.float64).reshape(-1), preds
+
+    def _get_explainer(self):
+        """Build the TreeExplainer once, on first use; shap is only imported when needed."""
+        if self._explainer is None:
+            import shap
+
+            self._explainer = shap.TreeExplainer(self.model)
+        return self._explainer
 
     def get_shap_values(self, input_dict: Dict[str, Union[float, str]]):
         """
@@ -201,17 +346,23 @@ class CreditRiskPredictor:
             input_dict: Dictionary containing the input features
             
         Returns:
-            Tuple of (shap_values, expected_value, features_df)
+            Tuple of (shap_values, expected_value, feature_names); SHAP columns follow feature_names
         """
-        import shap
-
         # Preprocess features
         scaled_features = self.preprocess_features(input_dict)
-        df_input = pd.DataFrame([input_dict])
         
         # Calculate SHAP values
-        explainer = shap.TreeExplainer(self.model)
-        shap_values = explainer.shap_values(scaled_features)
-        expected_value = explainer.expected_value
+        shap_values, expected_value = self.get_shap_values_from_prepared(scaled_features)
+        
+        return shap_values, expected_value, self.feature_names
+
+    def get_shap_values_from_prepared(self, scaled_features):
+        """
+        Get SHAP values for an already preprocessed feature matrix (see preprocess_batch).
+        Columns follow self.feature_names.
         
-        return shap_values, expected_value, df_input
\ No newline at end of file
+        Returns:
+            Tuple of (shap_values, expected_value)
+        """
+        explainer = self._get_explainer()
+        return explainer.shap_values(scaled_features), explainer.expected_value
@@ -55,13 +55,8 @@ class DatabaseRetrainer:
         Returns:
             Dictionary with readiness status and statistics
         """
-        # Get all predictions
-        all_predictions = crud.get_predictions(db, limit=10000)
-        total_predictions = len(all_predictions)
-
-        # Get predictions with feedback
-        predictions_with_feedback = [p for p in all_predictions if p.actual_outcome is not None]
-        feedback_count = len(predictions_with_feedback)
+        # Count in the database instead of loading the predictions just to len() them
+        total_predictions, feedback_count = crud.get_feedback_counts(db)
 
         # Calculate feedback ratio
         feedback_ratio = feedback_count / total_predictions if total_predictions > 0 else 0
@@ -95,22 +90,16 @@ class DatabaseRetrainer:
         all_data_records = []
         all_labels = []
         
-        # 1. Get predictions with feedback from database
-        predictions = crud.get_predictions(db, limit=10000)
-        predictions_with_feedback = [p for p in predictions if p.actual_outcome is not None and p.input_features]
-
-        logger.info(f"Found {len(predictions_with_feedback)} predictions with feedback in database")
-
-        # Convert database predictions to records
-        for pred in predictions_with_feedback:
-            try:
-                # Get input features
-                features = pred.input_features
-                all_data_records.append(features)
-                all_labels.append(pred.actual_outcome)
-            except Exception as e:
-                logger.warning(f"Failed to process prediction {pred.id}: {e}")
+        # 1. Get predictions with feedback from database, streamed rather than loaded at once
+        db_sample_count = 0
+        for pred in crud.iter_predictions(db, with_feedback=True, limit=10000):
+            if not pred.input_features:
                 continue
+            all_data_records.append(pred.input_features)
+            all_labels.append(pred.actual_outcome)
+            db_sample_count += 1
+
+        logger.info(f"Found {db_sample_count} predictions with feedback in database")
 
         # 2. Optionally load and combine with original training dataset
         if include_original_dataset:
@@ -183,7 +172,7 @@ class DatabaseRetrainer:
         df = pd.DataFrame(all_data_records)
         y = pd.Series(all_labels, name="loan_status")
 
-        logger.info(f"Extracted {len(df)} total samples ({len(predictions_with_feedback)} from database, {len(df) - len(predictions_with_feedback)} from original dataset) with {len(df.columns)} features")
+        logger.info(f"Extracted {len(df)} total samples ({db_sample_count} from database, {len(df) - db_sample_count} from original dataset) with {len(df.columns)} features")
         logger.info(f"Feature columns: {list(df.columns)}")
 
         return df, y
@@ -235,13 +224,10 @@ class DatabaseRetrainer:
             # Fill missing
             df_processed[col] = df_processed[col].fillna("UNKNOWN").astype(str).str.upper()
 
-            # One-hot encode
-            # We use get_dummies
-            dummies = pd.get_dummies(df_processed[col], prefix=col, drop_first=False)
-            df_processed = pd.concat([df_processed, dummies], axis=1)
-            
-            # Drop original column
-            df_processed = df_processed.drop(columns=[col])
+        # One-hot encode all categorical columns in one pass; get_dummies drops the originals
+        # and appends the dummies in column order, without re-copying the frame per column
+        if categorical_features:
+            df_processed = pd.get_dummies(df_processed, columns=categorical_features, drop_first=False)
 
         # Ensure all columns are numeric now
         # (get_dummies creates numeric, original numerics are numeric)
@@ -152,23 +152,20 @@ class FlexibleModelTrainer:
 
         y = y.astype(int)
 
-        # Process features
-        X = pd.DataFrame()
-
-        # Add numeric features
-        for col in numeric_features:
-            if col in df.columns:
-                X[col] = pd.to_numeric(df[col], errors="coerce").fillna(df[col].median())
-
-        # One-hot encode categorical features
-        for col in categorical_features:
-            if col in df.columns:
-                # Convert to string and handle missing
-                df[col] = df[col].fillna("UNKNOWN").astype(str)
+        # Process features, collecting the columns and building the frame once
+        # (inserting/concatenating per column copies the growing frame every time)
+        numeric = {
+            col: pd.to_numeric(df[col], errors="coerce").fillna(df[col].median())
+            for col in numeric_features
+            if col in df.columns
+        }
+        X = pd.DataFrame(numeric, index=df.index)
 
-                # One-hot encode
-                dummies = pd.get_dummies(df[col], prefix=col, drop_first=False)
-                X = pd.concat([X, dummies], axis=1)
+        # One-hot encode categorical features (missing values become "UNKNOWN") in one pass
+        categorical = [col for col in categorical_features if col in df.columns]
+        if categorical:
+            categories = df[categorical].fillna("UNKNOWN").astype(str)
+            X = pd.concat([X, pd.get_dummies(categories, prefix=categorical, drop_first=False)], axis=1)
 
         preprocessing_info = {
             "target_column": target_col,
@@ -210,6 +207,18 @@ class FlexibleModelTrainer:
         df = pd.read_csv(csv_path)
         logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
 
+        return self._train(df, csv_path, column_mapping, test_size, random_state, model_params)
+
+    def _train(
+        self,
+        df: pd.DataFrame,
+        source: str,
+        column_mapping: Optional[Dict[str, Any]],
+        test_size: float,
+        random_state: int,
+        model_params: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Shared training path; source is recorded in the manifest as training_info.csv_path."""
         # Preprocess
         X, y, preprocessing_info = self.preprocess_data(df, column_mapping)
 
@@ -290,7 +299,7 @@ class FlexibleModelTrainer:
             "metrics": metrics,
             "preprocessing_info": preprocessing_info,
             "training_info": {
-                "csv_path": csv_path,
+                "csv_path": source,
                 "n_samples": len(df),
                 "n_train": len(X_train),
                 "n_test": len(X_test),
@@ -312,7 +321,7 @@ class FlexibleModelTrainer:
             "model_path": str(model_path),
             "metrics": metrics,
             "preprocessing_info": preprocessing_info,
-            "training_info": manifest["training_info"],
+            "training_info": new_entry["training_info"],
         }
 
     def train_from_dataframe(
@@ -322,6 +331,7 @@ class FlexibleModelTrainer:
         test_size: float = 0.2,
         random_state: int = 42,
         model_params: Optional[Dict[str, Any]] = None,
+        source: str = "dataframe",
     ) -> Dict[str, Any]:
         """
         Train a model directly from a DataFrame.
@@ -332,6 +342,7 @@ class FlexibleModelTrainer:
             test_size: Proportion of data for testing
             random_state: Random seed
             model_params: Optional XGBoost parameters
+            source: Where the data came from (e.g. the uploaded file name), recorded in the manifest
 
         Returns:
             Training results and metrics
@@ -339,19 +350,4 @@ class FlexibleModelTrainer:
         logger.info(f"Starting flexible model training from DataFrame")
         logger.info(f"Data shape: {df.shape}")
 
-        # Save to temporary CSV and use train_model
-        temp_csv = self.models_dir / "temp_training_data.csv"
-        df.to_csv(temp_csv, index=False)
-
-        result = self.train_model(
-            str(temp_csv),
-            column_mapping=column_mapping,
-            test_size=test_size,
-            random_state=random_state,
-            model_params=model_params,
-        )
-
-        # Clean up temp file
-        temp_csv.unlink()
-
-        return result
+        return self._train(df, source, column_mapping, test_size, random_state, model_params)
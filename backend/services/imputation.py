@@ -15,6 +15,9 @@ from pydantic import BaseModel, Field, field_validator
 
 logger = logging.getLogger(__name__)
 
+# Outcome/label columns that may arrive with uploaded data but must never be used as features
+TARGET_COLUMNS = frozenset({"loan_status", "loan_status_num", "default", "target", "label", "outcome"})
+
 
 class DynamicLoanApplication(BaseModel):
     """
@@ -122,10 +125,10 @@ class FeatureImputer:
         3. Use safe domain-specific defaults
         """
         # Exclude target columns (they should never be used as features)
-        target_columns = {"loan_status", "loan_status_num", "default", "target", "label", "outcome"}
-        filtered_data = {k: v for k, v in data.items() if k not in target_columns}
-        
-        imputed = filtered_data.copy()
+        if TARGET_COLUMNS.isdisjoint(data):
+            imputed = dict(data)
+        else:
+            imputed = {k: v for k, v in data.items() if k not in TARGET_COLUMNS}
         imputation_log = []
 
         # Derive loan_percent_income if missing but loan_amnt and person_income are present
@@ -209,35 +212,38 @@ class DynamicFeatureMapper:
             "loan_grade": ["A", "B", "C", "D", "E", "F", "G"],
             "cb_person_default_on_file": ["Y", "N"],
         }
+        # Positions in the model's feature order, for building rows without intermediate dicts
+        self._feature_index = {feat: i for i, feat in enumerate(expected_features)}
+        self._numeric_positions = [
+            (feat, self._feature_index[feat]) for feat in self.numeric_features if feat in self._feature_index
+        ]
+
+    # Input field -> one-hot column prefix (home_ownership -> person_home_ownership_RENT, etc.)
+    ONE_HOT_FIELDS = (
+        ("home_ownership", "person_home_ownership"),
+        ("loan_intent", "loan_intent"),
+        ("loan_grade", "loan_grade"),
+        ("default_on_file", "cb_person_default_on_file"),
+    )
 
     def map_to_model_features(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert dynamic input to model-expected one-hot encoded format.
         """
-        # Exclude target columns (they should never be used as features)
-        target_columns = {"loan_status", "loan_status_num", "default", "target", "label", "outcome"}
-        filtered_data = {k: v for k, v in data.items() if k not in target_columns}
-        
+        # Only the known feature fields below are read and none of them is in TARGET_COLUMNS,
+        # so target columns are ignored without copying the input to filter them out
         mapped = {}
 
         # Add numeric features directly
         for feat in self.numeric_features:
-            if feat in filtered_data:
-                mapped[feat] = filtered_data[feat]
+            if feat in data:
+                mapped[feat] = data[feat]
 
         # One-hot encode categorical features
-        # home_ownership -> person_home_ownership_RENT, etc.
-        if "home_ownership" in filtered_data and filtered_data["home_ownership"]:
-            mapped[f"person_home_ownership_{filtered_data['home_ownership']}"] = 1
-
-        if "loan_intent" in filtered_data and filtered_data["loan_intent"]:
-            mapped[f"loan_intent_{filtered_data['loan_intent']}"] = 1
-
-        if "loan_grade" in filtered_data and filtered_data["loan_grade"]:
-            mapped[f"loan_grade_{filtered_data['loan_grade']}"] = 1
-
-        if "default_on_file" in filtered_data and filtered_data["default_on_file"]:
-            mapped[f"cb_person_default_on_file_{filtered_data['default_on_file']}"] = 1
+        for field, prefix in self.ONE_HOT_FIELDS:
+            value = data.get(field)
+            if value:
+                mapped[f"{prefix}_{value}"] = 1
 
         return mapped
 
@@ -247,3 +253,23 @@ class DynamicFeatureMapper:
         """
         complete_features = {feat: mapped_features.get(feat, 0) for feat in self.expected_features}
         return complete_features
+
+    def to_feature_row(self, data: Dict[str, Any]) -> np.ndarray:
+        """
+        Map imputed input straight to a raw feature row in expected_features order.
+
+        Equivalent to validate_and_fill(map_to_model_features(data)) laid out as an array
+        (missing features 0, None as NaN), in one pass and without the intermediate dicts.
+        """
+        row = np.zeros(len(self.expected_features), dtype=np.float64)
+        for feat, idx in self._numeric_positions:
+            if feat in data:
+                value = data[feat]
+                row[idx] = np.nan if value is None else value
+        for field, prefix in self.ONE_HOT_FIELDS:
+            value = data.get(field)
+            if value:
+                idx = self._feature_index.get(f"{prefix}_{value}")
+                if idx is not None:
+                    row[idx] = 1.0
+        return row
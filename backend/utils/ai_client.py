@@ -4,6 +4,7 @@ Handles network errors gracefully with automatic retries.
 """
 
 import asyncio
+import importlib.util
 import json
 import logging
 import os
@@ -17,6 +18,10 @@ from backend.utils.api_counter import count_llm_request
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets concurrent LLM calls share one connection; httpx only supports it when the
+# optional h2 package (httpx[http2]) is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 class AIClientWithRetry:
     """
@@ -30,7 +35,13 @@ class AIClientWithRetry:
 
         self.use_openrouter = bool(self.openrouter_key)
         self.max_retries = 3
-        self.timeout = 30.0
+        # Fail fast when the provider is unreachable, but give generation itself time to finish
+        self.timeout = httpx.Timeout(30.0, connect=5.0)
+
+        # One pooled client reused for every call so keep-alive connections (and their TLS
+        # sessions) survive between requests; created lazily inside the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
 
         if self.use_openrouter:
             logger.info(f"AI Client initialized with OpenRouter (model: {self.openrouter_model})")
@@ -107,11 +118,31 @@ class AIClientWithRetry:
         if not self.openrouter_key and not self.gemini_key:
             return {"text": "", "raw": "", "error": "no_api_key"}
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            if self.use_openrouter:
-                return await self._call_openrouter(client, prompt, system_prompt)
-            else:
-                return await self._call_gemini(client, prompt, system_prompt)
+        client = self._get_http_client()
+        if self.use_openrouter:
+            return await self._call_openrouter(client, prompt, system_prompt)
+        else:
+            return await self._call_gemini(client, prompt, system_prompt)
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared AsyncClient, creating it on first use in the current event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            # Pooled connections belong to the loop that opened them, so a new loop gets a new client
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on application shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     async def _call_openrouter(
         self, client: httpx.AsyncClient, prompt: str, system_prompt: Optional[str] = None
@@ -210,3 +241,9 @@ def get_ai_client() -> AIClientWithRetry:
     if _ai_client is None:
         _ai_client = AIClientWithRetry()
     return _ai_client
+
+
+async def close_ai_client() -> None:
+    """Release the global AI client's pooled connections, if it was ever created."""
+    if _ai_client is not None:
+        await _ai_client.aclose()
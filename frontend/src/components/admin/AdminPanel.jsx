@@ -467,9 +467,13 @@ export default function AdminPanel() {
                       </div>
                       <div className="state-item">
                         <span className="state-label">Dynamic Predictor:</span>
-                        <span className={`state-value ${modelState.dynamic_predictor_loaded ? 'success' : 'error'}`}>
-                          {modelState.dynamic_predictor_loaded ? '✅ Loaded' : '❌ Not Loaded'}
-                        </span>
+                        {modelState.dynamic_predictor_status === 'not_loaded' ? (
+                          <span className="state-value">⏳ Loads on first use</span>
+                        ) : (
+                          <span className={`state-value ${modelState.dynamic_predictor_loaded ? 'success' : 'error'}`}>
+                            {modelState.dynamic_predictor_loaded ? '✅ Loaded' : '❌ Not Loaded'}
+                          </span>
+                        )}
                       </div>
                     </div>
                     
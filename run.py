@@ -14,4 +14,5 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 if __name__ == "__main__":
+    # uvicorn already uses uvloop and httptools when they are installed (see requirements.txt)
     uvicorn.run("backend.api.main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
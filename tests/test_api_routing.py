@@ -0,0 +1,37 @@
+"""Routing tests for the versioned API and legacy root-level paths."""
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from backend.api.main import API_V1_PREFIX, app
+
+
+@pytest.mark.unit
+def test_routers_registered_once_under_v1_prefix():
+    api_routes = [
+        (route.path, frozenset(route.methods)) for route in app.routes if isinstance(route, APIRoute) and route.path != "/"
+    ]
+
+    assert api_routes, "No API routes registered"
+    assert all(path.startswith(API_V1_PREFIX) for path, _ in api_routes)
+    assert len(api_routes) == len(set(api_routes))
+
+
+@pytest.mark.unit
+def test_legacy_paths_are_served_by_v1_routes():
+    client = TestClient(app)
+
+    legacy = client.get("/model/health")
+    versioned = client.get(f"{API_V1_PREFIX}/model/health")
+
+    assert legacy.status_code == versioned.status_code == 200
+    assert legacy.json() == versioned.json()
+
+
+@pytest.mark.unit
+def test_root_paths_are_not_rewritten():
+    client = TestClient(app)
+
+    assert client.get("/").status_code == 200
+    assert client.get("/openapi.json").status_code == 200
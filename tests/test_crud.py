@@ -0,0 +1,114 @@
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import crud
+from backend.database.config import Base
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_prediction_relationships_are_eager_loaded_or_raise(db_session):
+    app_id = crud.create_loan_application(db_session, {"person_age": 30, "loan_amnt": 1000.0}).id
+    crud.bulk_create_predictions(
+        db_session, [{"application_id": app_id, "risk_level": "Low Risk 🟢"} for _ in range(3)]
+    )
+    db_session.expunge_all()
+
+    statements = []
+    event.listen(db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    predictions = crud.get_predictions(db_session, with_application=True)
+    assert [p.loan_application.id for p in predictions] == [app_id] * 3
+    # One SELECT for the predictions plus one IN query for their applications
+    assert len(statements) == 2
+
+    loaded = crud.get_loan_application(db_session, app_id, with_predictions=True)
+    assert {p.risk_category for p in loaded.predictions} == {"low"}
+
+    db_session.expunge_all()
+    with pytest.raises(InvalidRequestError):
+        crud.get_predictions(db_session)[0].loan_application
+
+
+def test_prediction_statistics_cache_is_invalidated_by_writes(db_session):
+    crud.bulk_create_predictions(db_session, [{"risk_level": "High Risk 🔴"}, {"risk_level": "Low Risk 🟢"}])
+    stats = crud.get_prediction_statistics(db_session)
+    assert (stats["total_predictions"], stats["high_risk_count"], stats["low_risk_count"]) == (2, 1, 1)
+
+    # A write made outside crud is only seen once the cache is dropped
+    db_session.execute(text("DELETE FROM predictions"))
+    assert crud.get_prediction_statistics(db_session)["total_predictions"] == 2
+
+    crud.create_prediction(db_session, {"risk_level": "High Risk 🔴"})
+    assert crud.get_prediction_statistics(db_session)["high_risk_count"] == 1
+    assert crud.get_prediction_statistics(db_session)["total_predictions"] == 1
+
+
+def test_statistics_read_during_a_write_is_not_kept_after_commit(db_session):
+    crud.bulk_create_predictions(db_session, [{"risk_level": "Low Risk 🟢"}])
+    crud.invalidate_statistics_cache()
+
+    # A dashboard read landing just before the commit caches the pre-write counts
+    stale = {"total_predictions": 1}
+    event.listen(
+        db_session,
+        "before_commit",
+        lambda session: crud._cached_statistics(session, "predictions", lambda: dict(stale)),
+        once=True,
+    )
+    crud.create_prediction(db_session, {"risk_level": "High Risk 🔴"})
+
+    assert crud.get_prediction_statistics(db_session)["total_predictions"] == 2
+
+
+def test_statistics_load_overlapping_an_invalidation_is_not_cached(db_session):
+    def load():
+        crud.invalidate_statistics_cache()  # a write commits while the counts are loading
+        return {"total_predictions": 0}
+
+    assert crud._cached_statistics(db_session, "predictions", load) == {"total_predictions": 0}
+    assert crud._statistics_cache == {}
+
+
+def test_clear_database_drops_cached_statistics(db_session):
+    from backend.api.clear_database_endpoint import clear_database
+
+    crud.bulk_create_predictions(db_session, [{"risk_level": "Low Risk 🟢"}])
+    assert crud.get_prediction_statistics(db_session)["total_predictions"] == 1
+
+    clear_database(confirm=True, db=db_session)
+
+    assert crud.get_prediction_statistics(db_session)["total_predictions"] == 0
+
+
+def test_init_db_adds_risk_category_to_unversioned_schema(monkeypatch):
+    from backend.database import config
+
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE predictions (id INTEGER PRIMARY KEY, risk_level VARCHAR(50))"))
+        conn.execute(text("INSERT INTO predictions (risk_level) VALUES ('High Risk 🔴'), ('Historical')"))
+    monkeypatch.setattr(config, "engine", engine)
+
+    config.init_db()
+    # A second startup finds the column and leaves the schema alone
+    config.init_db()
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT risk_level, risk_category FROM predictions ORDER BY id")).all()
+        indexes = {index["name"] for index in inspect(conn).get_indexes("predictions")}
+    assert rows == [("High Risk 🔴", "high"), ("Historical", None)]
+    assert "ix_predictions_risk_category" in indexes
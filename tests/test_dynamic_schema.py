@@ -77,3 +77,50 @@ def test_insert_with_existing_dynamic_column(db_session):
     # 3. Verify data
     result = db_session.execute(text("SELECT existing_dyn_col FROM loan_applications WHERE id = :id"), {"id": app.id}).fetchone()
     assert result[0] == 999.99
+
+def test_loan_application_table_reflection_refreshes_after_add_column(db_session):
+    # 1. Reflection is cached per engine
+    table = crud.get_loan_application_table(db_session)
+    assert crud.get_loan_application_table(db_session) is table
+    assert "cached_dyn_col" not in table.columns
+
+    # 2. Adding a column invalidates the cached reflection
+    crud.add_column_if_not_exists(db_session, "loan_applications", "cached_dyn_col", "FLOAT")
+
+    table = crud.get_loan_application_table(db_session)
+    assert "cached_dyn_col" in table.columns
+
+def test_table_columns_cache_refreshes_after_ddl(db_session):
+    assert crud.get_table_columns(db_session, "no_such_table") is None
+
+    columns = crud.get_table_columns(db_session, "loan_applications")
+    assert "person_age" in columns
+    assert "cached_col_list" not in columns
+
+    crud.add_column_if_not_exists(db_session, "loan_applications", "cached_col_list", "FLOAT")
+
+    assert "cached_col_list" in crud.get_table_columns(db_session, "loan_applications")
+
+def test_bulk_create_loan_applications_adds_columns_once(db_session):
+    rows = [{"person_age": 20 + i, "bulk_dyn_num": i * 1.5, "bulk_dyn_str": f"v{i}"} for i in range(5)]
+
+    ids = crud.bulk_create_loan_applications(db_session, rows)
+
+    assert len(ids) == 5
+    columns = crud.get_table_columns(db_session, "loan_applications")
+    assert {"bulk_dyn_num", "bulk_dyn_str"} <= set(columns)
+    result = db_session.execute(
+        text("SELECT id, bulk_dyn_num, bulk_dyn_str FROM loan_applications ORDER BY id")
+    ).fetchall()
+    assert [tuple(r) for r in result] == [(i, row["bulk_dyn_num"], row["bulk_dyn_str"]) for i, row in zip(ids, rows)]
+
+def test_add_columns_if_not_exist_adds_only_missing(db_session):
+    crud.add_columns_if_not_exist(db_session, "loan_applications", {"multi_a": "FLOAT", "person_age": "FLOAT"})
+    crud.add_columns_if_not_exist(db_session, "loan_applications", {"multi_a": "FLOAT", "multi_b": "VARCHAR(255)"})
+
+    columns = crud.get_table_columns(db_session, "loan_applications")
+    assert {"multi_a", "multi_b"} <= set(columns)
+    assert columns.count("person_age") == 1
+
+    with pytest.raises(ValueError):
+        crud.add_columns_if_not_exist(db_session, "loan_applications", {"bad name; --": "FLOAT"})
@@ -0,0 +1,48 @@
+"""Unit tests for the model management routes."""
+
+import pytest
+
+from backend.api.routes import model
+from backend.api.routes.model import ModelManager
+
+
+@pytest.fixture
+def fresh_dynamic_state(monkeypatch):
+    monkeypatch.setattr(ModelManager, "_dynamic_predictor", None)
+    monkeypatch.setattr(ModelManager, "_dynamic_failed", False)
+    monkeypatch.setattr(model, "_model_state_cache", None)
+
+    def fail_build():
+        raise AssertionError("/state must not build the dynamic predictor")
+
+    monkeypatch.setattr(ModelManager, "_load_dynamic_predictor", fail_build)
+
+
+@pytest.mark.unit
+def test_state_reports_dynamic_predictor_without_building_it(fresh_dynamic_state, monkeypatch):
+    state = model.get_model_state()
+
+    assert state["dynamic_predictor_loaded"] is False
+    assert state["dynamic_predictor_status"] == "not_loaded"
+    assert ModelManager._dynamic_predictor is None
+
+    monkeypatch.setattr(ModelManager, "_dynamic_failed", True)
+    monkeypatch.setattr(model, "_model_state_cache", None)
+
+    assert model.get_model_state()["dynamic_predictor_status"] == "failed"
+
+
+@pytest.mark.unit
+def test_reload_keeps_dynamic_predictor_when_rebuild_fails(monkeypatch):
+    import backend.models.predictor as predictor_module
+
+    current = object()
+    monkeypatch.setattr(ModelManager, "_predictor", None)
+    monkeypatch.setattr(ModelManager, "_health_body", ModelManager._health_body)
+    monkeypatch.setattr(ModelManager, "_dynamic_predictor", current)
+    monkeypatch.setattr(predictor_module, "CreditRiskPredictor", lambda: object())
+    monkeypatch.setattr(ModelManager, "_warm_up", classmethod(lambda cls, predictor, name: None))
+    monkeypatch.setattr(ModelManager, "_build_dynamic_predictor", classmethod(lambda cls: None))
+
+    assert ModelManager.load_models() is True
+    assert ModelManager._dynamic_predictor is current
@@ -0,0 +1,285 @@
+"""Unit tests for the prediction routes and their helpers (LLM cache, batch streaming)."""
+
+import asyncio
+
+import numpy as np
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.main import API_V1_PREFIX, app
+from backend.api.routes import prediction
+from backend.api.routes.model import ModelManager
+
+SHAP = {"loan_grade_D": 0.9, "person_income": -0.6, "loan_int_rate": 0.4, "person_age": 0.1, "loan_amnt": 0.05}
+APPLICANT = {
+    "person_age": 30,
+    "person_income": 50000.0,
+    "loan_amnt": 10000.0,
+    "loan_int_rate": 14.2,
+    "loan_intent": "MEDICAL",
+    "loan_grade": "D",
+}
+
+
+class FakeAIClient:
+    def __init__(self):
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    async def generate_with_retry(self, prompt, system_prompt):
+        self.calls += 1
+        return {"text": f"explanation {self.calls}", "raw": ""}
+
+
+@pytest.fixture
+def ai_client(monkeypatch):
+    client = FakeAIClient()
+    monkeypatch.setattr(prediction, "get_ai_client", lambda: client)
+    prediction._llm_cache.clear()
+    yield client
+    prediction._llm_cache.clear()
+
+
+def _explain(input_data):
+    return asyncio.run(prediction.generate_llm_explanation(input_data, SHAP, "High Risk 🔴"))
+
+
+@pytest.mark.unit
+def test_llm_cache_hit_for_identical_input(ai_client):
+    first = _explain(APPLICANT)
+    second = _explain(dict(APPLICANT))
+
+    assert ai_client.calls == 1
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["text"] == first["text"]
+
+
+@pytest.mark.unit
+def test_llm_cache_miss_when_categorical_changes(ai_client):
+    _explain(APPLICANT)
+    other = _explain({**APPLICANT, "loan_intent": "EDUCATION"})
+
+    assert ai_client.calls == 2
+    assert other["cache_hit"] is False
+    assert other["text"] == "explanation 2"
+
+
+@pytest.mark.unit
+def test_llm_cache_miss_when_a_quoted_figure_changes(ai_client):
+    _explain(APPLICANT)
+    # The prompt quotes the raw income, so even a few dollars apart must not reuse the text
+    other = _explain({**APPLICANT, "person_income": 50010.0})
+
+    assert ai_client.calls == 2
+    assert other["cache_hit"] is False
+
+
+@pytest.mark.unit
+def test_llm_cache_entries_expire_after_ttl(ai_client, monkeypatch):
+    _explain(APPLICANT)
+    monkeypatch.setattr(prediction, "LLM_CACHE_TTL_SECONDS", 0.0)
+
+    again = _explain(APPLICANT)
+
+    assert ai_client.calls == 2
+    assert again["cache_hit"] is False
+
+
+@pytest.mark.unit
+def test_llm_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(prediction, "LLM_CACHE_MAX_ENTRIES", 2)
+    prediction._llm_cache.clear()
+    try:
+        prediction._llm_cache_put("a", {"text": "a"})
+        prediction._llm_cache_put("b", {"text": "b"})
+        # Reading "a" makes "b" the least recently used entry
+        assert prediction._llm_cache_get("a") == {"text": "a"}
+        prediction._llm_cache_put("c", {"text": "c"})
+
+        assert prediction._llm_cache_get("b") is None
+        assert prediction._llm_cache_get("a") == {"text": "a"}
+        assert prediction._llm_cache_get("c") == {"text": "c"}
+    finally:
+        prediction._llm_cache.clear()
+
+
+# ==================== Dynamic predictor loading ====================
+
+
+@pytest.mark.unit
+def test_dynamic_predictor_is_built_off_the_event_loop(monkeypatch):
+    import threading
+
+    build_threads = []
+
+    def build(cls):
+        build_threads.append(threading.get_ident())
+        return None
+
+    monkeypatch.setattr(ModelManager, "_dynamic_predictor", None)
+    monkeypatch.setattr(ModelManager, "get_dynamic_predictor", classmethod(build))
+
+    async def get():
+        return threading.get_ident(), await prediction._get_dynamic_predictor()
+
+    loop_thread, predictor = asyncio.run(get())
+
+    assert predictor is None
+    assert build_threads and build_threads[0] != loop_thread
+
+
+# ==================== /predict_risk_batch?stream=true ====================
+
+BATCH_ROWS = [
+    {"person_age": 30, "person_income": 50000.0, "loan_amnt": 10000.0, "loan_grade": "A"},
+    {"person_age": 41, "person_income": 0.0, "loan_amnt": 9000.0},
+    {"person_age": 23, "person_income": 9000.0, "loan_amnt": 25000.0, "loan_grade": "G"},
+]
+FAILING_AGE = 41
+
+
+@pytest.fixture(scope="module")
+def dynamic_predictor():
+    from backend.models.dynamic_predictor import DynamicCreditRiskPredictor
+
+    return DynamicCreditRiskPredictor()
+
+
+@pytest.fixture
+def batch_client(dynamic_predictor, monkeypatch):
+    prepare_row = dynamic_predictor.prepare_row
+
+    def failing_prepare_row(input_data):
+        if input_data.get("person_age") == FAILING_AGE:
+            raise ValueError("bad row")
+        return prepare_row(input_data)
+
+    async def fake_llm_explanation(input_data, shap_explanation, risk_level):
+        return {"text": f"explained {input_data['person_age']}", "remediation_suggestion": None}
+
+    monkeypatch.setattr(dynamic_predictor, "prepare_row", failing_prepare_row)
+    monkeypatch.setattr(ModelManager, "get_dynamic_predictor", classmethod(lambda cls: dynamic_predictor))
+    monkeypatch.setattr(prediction, "generate_llm_explanation", fake_llm_explanation)
+    return TestClient(app)
+
+
+def _ndjson(response):
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    body = response.content
+    # One JSON object per line, each terminated by a newline
+    assert body.endswith(b"\n")
+    return [orjson.loads(line) for line in body.split(b"\n")[:-1]]
+
+
+@pytest.mark.unit
+def test_batch_stream_without_explanations_matches_json_response(batch_client):
+    url = f"{API_V1_PREFIX}/predict_risk_batch"
+    streamed = _ndjson(batch_client.post(url, params={"stream": "true"}, json=BATCH_ROWS))
+    regular = batch_client.post(url, json=BATCH_ROWS).json()
+
+    # Nothing is pending, so rows arrive in input order, identical to the regular response
+    assert [row["index"] for row in streamed] == [0, 1, 2]
+    assert streamed == regular["results"]
+    assert streamed[1] == {"index": 1, "status": "error", "error": "bad row"}
+    assert all("shap_explanation" not in row for row in streamed)
+
+
+@pytest.mark.unit
+def test_batch_stream_writes_finished_rows_before_explained_ones(batch_client):
+    response = batch_client.post(
+        f"{API_V1_PREFIX}/predict_risk_batch",
+        params={"stream": "true", "include_explanations": "true"},
+        json=BATCH_ROWS,
+    )
+    lines = _ndjson(response)
+
+    assert len(lines) == 3
+    # The error row has no LLM call to wait for, so it is written first
+    assert lines[0] == {"index": 1, "status": "error", "error": "bad row"}
+    explained = {row["index"]: row for row in lines[1:]}
+    assert sorted(explained) == [0, 2]
+    for index, row in explained.items():
+        assert row["status"] == "success"
+        assert row["llm_explanation"] == f"explained {BATCH_ROWS[index]['person_age']}"
+        assert row["shap_explanation"]
+
+
+@pytest.mark.unit
+def test_batch_stream_serializes_numpy_values():
+    async def collect():
+        results = [{"index": 0, "input_features": {"person_age": np.int64(30)}, "scores": np.array([0.5])}]
+        return [line async for line in prediction._stream_batch_results(results, [])]
+
+    assert asyncio.run(collect()) == [b'{"index":0,"input_features":{"person_age":30},"scores":[0.5]}\n']
+
+
+# ==================== Drift check ====================
+
+
+def _reference_drift_warnings(data):
+    """The original per-feature drift loop, kept as the reference for the vectorized check."""
+    warnings = []
+    for feat, stats in prediction.FEATURE_STATS.items():
+        if feat not in data:
+            continue
+        try:
+            val = float(data[feat])
+        except Exception:
+            continue
+        mn, mx, mean, std = stats.get("min"), stats.get("max"), stats.get("mean"), stats.get("std")
+        if mn is not None and mx is not None and (val < mn or val > mx):
+            warnings.append(f"{feat}: value {val} outside training min/max [{mn}, {mx}]")
+        elif mean is not None and std is not None and std >= 0:
+            lower, upper = mean - 3 * std, mean + 3 * std
+            if val < lower or val > upper:
+                warnings.append(f"{feat}: value {val} outside 3-sigma range [{lower:.2f}, {upper:.2f}]")
+    return warnings
+
+
+def _drift_warnings(data):
+    return prediction._format_drift(prediction._check_drift(data))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        # In range (and within 3 sigma)
+        ({"person_age": 30, "loan_amnt": 10000.0, "loan_int_rate": 11.0}, []),
+        # Above the training max
+        ({"person_age": 150}, ["person_age: value 150.0 outside training min/max [20.0, 144.0]"]),
+        # Below the training min
+        ({"person_income": 1000}, ["person_income: value 1000.0 outside training min/max [4000.0, 6000000.0]"]),
+        # Inside min/max but outside 3 sigma
+        ({"person_age": 99}, ["person_age: value 99.0 outside 3-sigma range [8.59, 46.94]"]),
+        # Features without statistics and non-numeric values are skipped
+        ({"extra_col": 1e12, "loan_grade": "G", "loan_amnt": "n/a"}, []),
+        (
+            {"loan_int_rate": 30.0, "person_age": 99, "extra_col": -1, "person_income": None},
+            [
+                "person_age: value 99.0 outside 3-sigma range [8.59, 46.94]",
+                "loan_int_rate: value 30.0 outside training min/max [5.42, 22.48]",
+            ],
+        ),
+    ],
+)
+def test_drift_warnings(data, expected):
+    assert _drift_warnings(data) == expected
+    assert _drift_warnings(data) == _reference_drift_warnings(data)
+
+
+@pytest.mark.unit
+def test_drift_warnings_match_reference_loop_on_random_inputs():
+    rng = np.random.default_rng(0)
+    features = [*prediction.FEATURE_STATS, "extra_col"]
+    for _ in range(500):
+        data = {
+            feat: float(rng.normal(0, 1) * 10 ** rng.integers(0, 7))
+            for feat in features
+            if rng.random() < 0.6
+        }
+        assert _drift_warnings(data) == _reference_drift_warnings(data)
@@ -6,6 +6,8 @@ Run with: pytest -q (or `python -m pytest -q` from project root).
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 
 # Ensure project root is on sys.path so imports work when running tests
@@ -40,3 +42,77 @@ def test_predictor_smoke():
     assert 0.0 <= prob <= 1.0, f"Probability {prob} not in valid range [0,1]"
     assert pred in (0, 1), f"Prediction {pred} not in valid set {{0, 1}}"
     assert risk_level in ["Low Risk 🟢", "Medium Risk 🟡", "High Risk 🔴"], f"Risk level '{risk_level}' not recognized"
+
+
+@pytest.mark.unit
+def test_predict_batch_matches_single_predictions():
+    """Batch prediction should return the same results as predicting each row on its own."""
+    rows = [
+        {"person_age": 30, "person_income": 50000.0, "loan_amnt": 10000.0, "loan_grade_A": 1},
+        {"person_age": 45, "person_income": 20000.0, "loan_amnt": 15000.0, "loan_grade_E": 1},
+    ]
+
+    predictor = CreditRiskPredictor()
+    batch = predictor.predict_batch(rows)
+
+    assert batch == [predictor.predict(row) for row in rows]
+
+
+@pytest.mark.unit
+def test_preprocess_array_matches_preprocess_features():
+    """Scaling an ndarray row should match scaling the equivalent feature dict."""
+    predictor = CreditRiskPredictor()
+    row = {"person_age": 30, "person_income": 50000.0, "loan_amnt": 10000.0, "loan_grade_A": 1}
+    array_row = np.array([row.get(name, 0) for name in predictor.feature_names], dtype=np.float64)
+
+    np.testing.assert_allclose(predictor.preprocess_array(array_row), predictor.preprocess_features(row))
+
+
+@pytest.mark.unit
+def test_preprocess_batch_matches_scaler_on_dataframe():
+    """The ndarray preprocessing should match running the fitted scaler on a DataFrame."""
+    predictor = CreditRiskPredictor()
+    rows = [
+        {"person_age": 30, "person_income": 50000.0, "loan_amnt": 10000.0, "loan_grade_A": 1},
+        {"person_age": 45, "person_income": None, "loan_grade_E": 1},
+    ]
+    expected = predictor.scaler.transform(
+        pd.DataFrame([{col: row.get(col, 0) for col in predictor.feature_names} for row in rows])
+    )
+
+    np.testing.assert_allclose(predictor.preprocess_batch(rows), expected)
+
+
+@pytest.mark.unit
+def test_booster_predictions_match_estimator_api():
+    """The inplace_predict fast path should agree with predict()/predict_proba()."""
+    predictor = CreditRiskPredictor()
+    rows = [
+        {"person_age": 30, "person_income": 50000.0, "loan_amnt": 10000.0, "loan_grade_A": 1},
+        {"person_age": 23, "person_income": 9000.0, "loan_amnt": 25000.0, "loan_grade_G": 1},
+    ]
+    scaled = predictor.preprocess_batch(rows)
+
+    probs, preds = predictor._predict_with_estimator(scaled)
+    fast = predictor.predict_prepared(scaled)
+
+    np.testing.assert_allclose([prob for _, prob, _ in fast], probs)
+    assert [pred for _, _, pred in fast] == preds.tolist()
+
+
+@pytest.mark.unit
+def test_feature_row_matches_mapped_and_filled_dict():
+    """DynamicFeatureMapper.to_feature_row should lay out the same values as validate_and_fill."""
+    from backend.services.imputation import DynamicFeatureMapper
+
+    predictor = CreditRiskPredictor()
+    mapper = DynamicFeatureMapper(predictor.feature_names)
+    inputs = [
+        {"person_age": 30, "person_income": 50000.0, "home_ownership": "RENT", "loan_grade": "B"},
+        {"person_income": None, "loan_intent": "UNKNOWN", "default_on_file": "Y"},
+    ]
+
+    for data in inputs:
+        filled = mapper.validate_and_fill(mapper.map_to_model_features(data))
+        expected = np.array([filled[name] for name in predictor.feature_names], dtype=np.float64)
+        np.testing.assert_array_equal(mapper.to_feature_row(data), expected)